@@ -2,23 +2,34 @@
 
 from scripts.data_loader import preprocess_data, extract_raw_genes
 from scripts.scheduler import run_scheduler
-from scripts.exporter import export_to_excel, export_to_json
+from scripts.exporter import export_schedule
+from scripts.run_metrics import RunMetrics
 
-def generate_schedule(input_excel_path, trimester):
-    import scripts.config as config
-    config.INPUT_FILE = input_excel_path
-
-    data = preprocess_data()
+def generate_schedule(input_excel_path, trimester, progress=None, cancel=None, metrics=None,
+                      time_budget=None, target_fitness=None):
+    # The input path is passed down rather than set on config, so concurrent jobs don't clash.
+    # Returns (best_schedule, fitness_progress, metrics); metrics is a RunMetrics recorder
+    # whose report also holds run_scheduler's run summary (stop reason, budget used).
+    metrics = metrics or RunMetrics()
+    with metrics.phase("load"):
+        data = preprocess_data(input_excel_path)
     groups_df = data["groups"]
     courses_df = data["courses"]
     rooms_df = data["rooms"]
 
-    raw_genes = extract_raw_genes(groups_df, courses_df, trimester)
+    with metrics.phase("extract"):
+        raw_genes = extract_raw_genes(groups_df, courses_df, trimester)
     valid_rooms = rooms_df["Room"].tolist()
-    best_schedule, fitness_progress = run_scheduler(raw_genes, valid_rooms) 
+    best_schedule, fitness_progress, _ = run_scheduler(
+        raw_genes, valid_rooms, progress=progress, cancel=cancel, metrics=metrics,
+        time_budget=time_budget, target_fitness=target_fitness
+    )
 
-    return best_schedule, fitness_progress
+    return best_schedule, fitness_progress, metrics
 
-def save_schedule(chromosome, output_excel_path, output_json_path):
-    export_to_excel(chromosome, output_excel_path)
-    export_to_json(chromosome, output_json_path)
+def save_schedule(chromosome, output_excel_path, output_json_path, metrics=None):
+    if metrics is None:
+        export_schedule(chromosome, output_json_path, output_excel_path)
+        return
+    with metrics.phase("export"):
+        export_schedule(chromosome, output_json_path, output_excel_path)
@@ -0,0 +1,157 @@
+# app/jobs.py
+
+import os
+import time
+import uuid
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from scripts.config import get_output_paths, JOB_WORKERS, PROFILE_RUNS, TRACE_MEMORY
+from scripts.result_cache import ResultCache, cache_key
+from scripts.run_metrics import RunMetrics
+
+MAX_FINISHED_JOBS = 50  # finished jobs kept in memory for status and downloads
+
+
+class Job:
+    """One background schedule generation, with its progress and outputs."""
+
+    def __init__(self, input_path, trimester, time_budget=None, target_fitness=None):
+        self.id = uuid.uuid4().hex
+        self.input_path = input_path
+        self.trimester = trimester
+        self.time_budget = time_budget        # seconds; None = run for config.GENERATIONS
+        self.target_fitness = target_fitness
+        self.status = "queued"      # queued -> running -> done / failed / cancelled
+        self.progress = []          # best fitness after every generation
+        self.metrics = None
+        self.error = None
+        self.json_path = None
+        self.excel_path = None
+        self.finished_at = None
+        self.cancel_event = threading.Event()
+        self.changed = threading.Condition()
+
+    @property
+    def finished(self):
+        return self.status in ("done", "failed", "cancelled")
+
+    def to_dict(self, since=0):
+        return {
+            "job_id": self.id,
+            "status": self.status,
+            "trimester": self.trimester,
+            "time_budget": self.time_budget,
+            "generation": len(self.progress),
+            "fitness_progress": self.progress[since:],
+            "metrics": self.metrics,
+            "error": self.error,
+        }
+
+    def _notify(self, **changes):
+        with self.changed:
+            for name, value in changes.items():
+                setattr(self, name, value)
+            self.changed.notify_all()
+
+    def on_generation(self, generation, best_fitness):
+        with self.changed:
+            self.progress.append(best_fitness)
+            self.changed.notify_all()
+
+    def wait(self, seen, timeout):
+        """Block until more than `seen` generations are known or the job finishes."""
+        with self.changed:
+            self.changed.wait_for(lambda: len(self.progress) > seen or self.finished, timeout)
+
+    def run(self):
+        from app.ga.ga_engine import generate_schedule, save_schedule
+        if self.cancel_event.is_set():
+            self._notify(status="cancelled", finished_at=time.time())
+            return
+        self._notify(status="running")
+        try:
+            key = cache_key(self.input_path, self.trimester,
+                            options={"time_budget": self.time_budget, "target_fitness": self.target_fitness})
+            cached = results.get(key)
+            if cached is not None:
+                metrics = dict(cached["metrics"], cached=True)
+                self._notify(json_path=cached["json_path"], excel_path=cached["excel_path"],
+                             progress=metrics["fitness_progress"], metrics=metrics,
+                             status="done", finished_at=time.time())
+                return
+
+            recorder = RunMetrics(profile=PROFILE_RUNS, trace_memory=TRACE_MEMORY)
+            recorder.start()
+            try:
+                best_schedule, fitness_progress, recorder = generate_schedule(
+                    self.input_path, int(self.trimester),
+                    progress=self.on_generation, cancel=self.cancel_event, metrics=recorder,
+                    time_budget=self.time_budget, target_fitness=self.target_fitness
+                )
+                json_out, excel_out = get_output_paths(self.trimester)
+                save_schedule(best_schedule, excel_out, json_out, metrics=recorder)
+            finally:
+                recorder.stop()
+            report = recorder.report()
+            fitness_score = best_schedule.fitness
+            metrics = {
+                "fitnessScore": round(10000 / (1 + fitness_score), 2),
+                "conflicts": int(fitness_score // 1000),
+                "hard": "-",
+                "soft": "-",
+                "time": round(report["elapsed"], 2),
+                "fitness_progress": fitness_progress,
+                "report": report
+            }
+            status = "cancelled" if self.cancel_event.is_set() else "done"
+            if status == "done":
+                results.put(key, json_out, excel_out, metrics)
+            self._notify(json_path=json_out, excel_path=excel_out, metrics=metrics,
+                         status=status, finished_at=time.time())
+        except Exception as e:
+            self._notify(error=str(e), status="failed", finished_at=time.time())
+        finally:
+            if os.path.exists(self.input_path):
+                os.remove(self.input_path)
+
+
+class JobManager:
+    """Runs generation jobs on a small thread pool and keeps them addressable by id."""
+
+    def __init__(self, workers=JOB_WORKERS):
+        self.executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="schedule-job")
+        self.jobs = {}
+        self.lock = threading.Lock()
+
+    def submit(self, input_path, trimester, time_budget=None, target_fitness=None):
+        job = Job(input_path, trimester, time_budget, target_fitness)
+        with self.lock:
+            self._prune()
+            self.jobs[job.id] = job
+        self.executor.submit(job.run)
+        return job
+
+    def get(self, job_id):
+        with self.lock:
+            return self.jobs.get(job_id)
+
+    def latest(self, trimester):
+        """Most recently finished job with outputs for the trimester."""
+        with self.lock:
+            jobs = [j for j in self.jobs.values() if j.trimester == str(trimester) and j.json_path]
+        return max(jobs, key=lambda j: j.finished_at, default=None)
+
+    def cancel(self, job_id):
+        job = self.get(job_id)
+        if job is not None and not job.finished:
+            job.cancel_event.set()
+        return job
+
+    def _prune(self):
+        finished = sorted((j for j in self.jobs.values() if j.finished), key=lambda j: j.finished_at)
+        for job in finished[:max(0, len(finished) - MAX_FINISHED_JOBS)]:
+            del self.jobs[job.id]
+
+
+results = ResultCache()
+jobs = JobManager()
@@ -1,15 +1,22 @@
 # app/routes.py
 
-from flask import Blueprint, request, send_file, jsonify, render_template
+from flask import (
+    Blueprint, request, send_file, jsonify, render_template, abort,
+    Response, stream_with_context,
+)
 import os
 import json
+import math
+import uuid
 from app.utils.schedule_check import (
     check_conflicts_and_violations,
     get_subject,
     get_group_prefix,
     advanced_conflict_and_violation_analysis,
 )
-from scripts.config import get_output_paths
+from app.jobs import jobs
+from scripts.schedule_json import load_schedule
+from scripts.config import MAX_TIME_BUDGET
 
 bp = Blueprint('main', __name__)
 
@@ -31,7 +38,7 @@ def check_schedule():
         tf = request.files["timetable"]
         gf = request.files.get("ga_input")
         timetable_name = tf.filename
-        timetable = json.load(tf)
+        timetable = load_schedule(tf)
         # --- Use ADVANCED logic with joint lectures exception handling ---
         conflict_table, violation_table = advanced_conflict_and_violation_analysis(
             timetable, timetable_name, gf
@@ -46,74 +53,154 @@ def check_schedule():
 
 @bp.route('/')
 def index():
-    return render_template('main_page.html')
+    return render_template('main_page.html', max_time_budget=MAX_TIME_BUDGET)
 
 
 @bp.route('/generate_schedule', methods=['POST'])
 def generate_schedule_route():
     """
-    Handles schedule generation and returns metrics JSON.
-    Saves files with dynamic names (year, timestamp, etc).
+    Starts schedule generation in the background and returns its job id.
+    Progress is available from /jobs/<id> (polling) or /jobs/<id>/events (Server-Sent Events).
+    Optional form fields: time_budget (seconds to evolve for) and target_fitness.
     """
     if 'file' not in request.files or 'trimester' not in request.form:
         return jsonify({'error': 'File or trimester not provided'}), 400
+    try:
+        time_budget = _optional_number('time_budget', positive=True, maximum=MAX_TIME_BUDGET)
+        target_fitness = _optional_number('target_fitness')  # 0 = stop at a conflict-free schedule
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
     file = request.files['file']
     trimester = request.form['trimester']
     os.makedirs(INPUTS_FOLDER, exist_ok=True)
-    input_path = os.path.join(INPUTS_FOLDER, 'GA_input.xlsx')
+    # One upload per job, so concurrent jobs never read each other's input
+    input_path = os.path.join(INPUTS_FOLDER, f'GA_input_{uuid.uuid4().hex}.xlsx')
     file.save(input_path)
-    from app.ga.ga_engine import generate_schedule, save_schedule
-    import time
+    job = jobs.submit(input_path, trimester, time_budget, target_fitness)
+    return jsonify(job.to_dict()), 202
+
+
+def _optional_number(field, positive=False, maximum=None):
+    # Finite non-negative (or positive) number from the form, at most `maximum`;
+    # None when the field is missing or empty
+    value = request.form.get(field, '').strip()
+    if not value:
+        return None
     try:
-        start = time.time()
-        # First call gets best_schedule & fitness_progress
-        best_schedule, fitness_progress = generate_schedule(input_path, int(trimester))
-        elapsed = round(time.time() - start, 2)
-        excel_out, json_out = get_output_paths(trimester)
-        save_schedule(best_schedule, excel_out, json_out)
-        fitness_score = best_schedule.fitness
-        conflicts = int(fitness_score // 1000)
-        metrics = {
-            "fitnessScore": round(10000 / (1 + fitness_score), 2),
-            "conflicts": conflicts,
-            "hard": "-",    
-            "soft": "-",    
-            "time": elapsed,
-            "fitness_progress": fitness_progress
-        }
-        return jsonify(metrics)
-    except Exception as e:
-        return jsonify({'error': 'Schedule generation failed!', 'details': str(e)}), 500
+        number = float(value)
+    except ValueError:
+        raise ValueError(f'{field} must be a number') from None
+    if not math.isfinite(number):
+        raise ValueError(f'{field} must be a finite number')
+    if positive and number <= 0:
+        raise ValueError(f'{field} must be a positive number')
+    if number < 0:
+        raise ValueError(f'{field} must not be negative')
+    if maximum is not None and number > maximum:
+        raise ValueError(f'{field} must be at most {maximum}')
+    return number
+
+
+def _get_job_or_404(job_id):
+    job = jobs.get(job_id)
+    if job is None:
+        abort(404, description="Job not found")
+    return job
+
+
+@bp.route('/jobs/<job_id>')
+def job_status(job_id):
+    """
+    Job status for polling; ?since=N returns only the fitness values after generation N.
+    """
+    job = _get_job_or_404(job_id)
+    return jsonify(job.to_dict(since=request.args.get('since', 0, type=int)))
+
+
+@bp.route('/jobs/<job_id>/events')
+def job_events(job_id):
+    """
+    Streams the job as Server-Sent Events: one "progress" event per batch of new
+    generations and a final "done" event with the metrics.
+    """
+    job = _get_job_or_404(job_id)
+
+    def stream():
+        seen = 0
+        while True:
+            job.wait(seen, timeout=15)
+            state = job.to_dict(since=seen)
+            seen += len(state["fitness_progress"])
+            if job.finished:
+                yield f"event: done\ndata: {json.dumps(state)}\n\n"
+                return
+            if state["fitness_progress"]:
+                yield f"event: progress\ndata: {json.dumps(state)}\n\n"
+            else:
+                yield ": keep-alive\n\n"
+
+    headers = {'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'}
+    return Response(stream_with_context(stream()), mimetype='text/event-stream', headers=headers)
+
+
+@bp.route('/jobs/<job_id>/report')
+def job_report(job_id):
+    """
+    The run report of a finished job: time per phase, evaluations per second, cache hits
+    (and a profile / peak memory when PROFILE_RUNS / TRACE_MEMORY are on).
+    """
+    job = _get_job_or_404(job_id)
+    report = (job.metrics or {}).get("report")
+    if report is None:
+        abort(404, description="No run report for this job")
+    return jsonify(report)
+
+
+@bp.route('/jobs/<job_id>/cancel', methods=['POST'])
+def cancel_job(job_id):
+    """
+    Asks a job to stop after its current generation; the best schedule so far is still saved.
+    """
+    _get_job_or_404(job_id)
+    return jsonify(jobs.cancel(job_id).to_dict())
+
+
+def _output_path(kind):
+    # Output of the requested job, else of the most recent finished job for the trimester
+    job_id = request.args.get('job')
+    trimester = request.args.get('trimester', '1')
+    job = jobs.get(job_id) if job_id else jobs.latest(trimester)
+    if job is not None and getattr(job, f"{kind}_path"):
+        return getattr(job, f"{kind}_path")
+    return None
+
 
 @bp.route('/download_excel')
 def download_excel():
     """
-    Downloads most recent Excel file for given trimester.
+    Downloads the Excel file of a job (?job=<id>) or the most recent one for given trimester.
     """
     trimester = request.args.get('trimester', '1')
-    # Use dynamic output (most recent) if possible
-    # Otherwise fallback to old path
-    _, excel_path = get_output_paths(trimester)
-    if not os.path.exists(excel_path):
+    excel_path = _output_path("excel")
+    if excel_path is None or not os.path.exists(excel_path):
         # fallback to old style, for backward compat
         fallback = os.path.join(OUTPUTS_FOLDER, f'timetable_T{trimester}.xlsx')
         if not os.path.exists(fallback):
             return "Excel file not found", 404
         return send_file(fallback, as_attachment=True, download_name=f'timetable_T{trimester}.xlsx')
-    return send_file(excel_path, as_attachment=True, download_name=os.path.basename(excel_path))
+    return send_file(os.path.abspath(excel_path), as_attachment=True, download_name=os.path.basename(excel_path))
 
 
 @bp.route('/download_json')
 def download_json():
     """
-    Downloads most recent JSON file for given trimester.
+    Downloads the JSON file of a job (?job=<id>) or the most recent one for given trimester.
     """
     trimester = request.args.get('trimester', '1')
-    json_path, _ = get_output_paths(trimester)
-    if not os.path.exists(json_path):
+    json_path = _output_path("json")
+    if json_path is None or not os.path.exists(json_path):
         fallback = os.path.join(OUTPUTS_FOLDER, f'timetable_T{trimester}.json')
         if not os.path.exists(fallback):
             return "JSON file not found", 404
         return send_file(fallback, as_attachment=True, download_name=f'timetable_T{trimester}.json')
-    return send_file(json_path, as_attachment=True, download_name=os.path.basename(json_path))
-
+    return send_file(os.path.abspath(json_path), as_attachment=True, download_name=os.path.basename(json_path))
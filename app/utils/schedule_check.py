@@ -1,8 +1,113 @@
 # app/utils/schedule_check.py
 import re
 import json
+import numpy as np
 import pandas as pd
 from collections import defaultdict
+from scripts.groups import get_group_info
+from scripts.input_cache import load_sheets
+
+def _curriculum_lookup(ga_input_file):
+    """
+    Returns lookup(ep, trimester) -> that EP's curriculum rows for the trimester, or None.
+    The workbook is parsed once (and cached by content), each EP sheet prepared once per request.
+    """
+    sheets = load_sheets(ga_input_file)
+    prepared = {}
+
+    def lookup(ep, trimester):
+        key = (ep, trimester)
+        if key not in prepared:
+            df = sheets.get(ep)
+            if df is not None:
+                df.columns = [c.lower().strip() for c in df.columns]
+            if df is None or 'trimester' not in df.columns:
+                prepared[key] = None
+            else:
+                df = df[df['trimester'] == trimester].copy()
+                df['course_name'] = df['course_name'].astype(str).str.strip().str.lower()
+                prepared[key] = df
+        return prepared[key]
+
+    return lookup
+
+SESSION_TYPES = ['lecture', 'practice', 'lab']
+
+def _map_trimester(base, year):
+    m = {1: {1:1, 2:2, 3:3}, 2: {1:4, 2:5, 3:6}, 3:{1:7, 2:8}}
+    return m.get(year, {}).get(base)
+
+def _violation_table(timetable, timetable_name, ga_input_file):
+    """
+    Courses whose scheduled hours fall short of the curriculum, as an HTML table (or None).
+    Required slots (curriculum rows of each group's EP and trimester) and actual slots
+    (10 per scheduled session) are built as DataFrames and compared in one merge.
+    """
+    if not ga_input_file:
+        return None
+    trimester_match = re.search(r'T(\d+)', timetable_name)
+    if not trimester_match:
+        return None
+    trimester_base = int(trimester_match.group(1))
+    curriculum = _curriculum_lookup(ga_input_file)
+
+    # Groups with the curriculum trimester they are checked against
+    group_rows = []
+    for order, group in enumerate(timetable):
+        info = get_group_info(group)
+        actual_trim = _map_trimester(trimester_base, info.study_year)
+        if actual_trim and actual_trim != 9:
+            group_rows.append((order, group, info.ep, actual_trim))
+    groups = pd.DataFrame(group_rows, columns=["group_order", "Group", "EP", "Trimester"])
+
+    # Required slots per (EP, trimester, course row, type), in sheet order
+    required = []
+    for ep, trim in groups[["EP", "Trimester"]].drop_duplicates().itertuples(index=False):
+        df = curriculum(ep, trim)
+        if df is None:
+            continue
+        df = df[(df['course_name'] != '') & (df['course_name'] != 'nan')]
+        for type_order, typ in enumerate(SESSION_TYPES):
+            sc = f"{typ}_slots"
+            if sc not in df.columns:
+                continue
+            slots = pd.to_numeric(df[sc], errors='coerce')
+            keep = slots.notna() & (slots.fillna(0).astype(int) > 0)
+            required.append(pd.DataFrame({
+                "EP": ep, "Trimester": trim,
+                "Course": df['course_name'][keep].to_numpy(),
+                "Type": typ,
+                "Required": slots[keep].astype(int).to_numpy(),
+                "row_order": np.flatnonzero(keep.to_numpy()),
+                "type_order": type_order,
+            }))
+    if not required:
+        return None
+    required = pd.concat(required, ignore_index=True)
+
+    # Actual slots: 10 per scheduled session of (group, course, type)
+    actual = pd.DataFrame(
+        [(group, s["course"].strip().lower(), s["type"].strip().lower())
+         for group, sessions in timetable.items() for s in sessions],
+        columns=["Group", "Course", "Type"]
+    )
+    actual = actual.groupby(["Group", "Course", "Type"]).size().mul(10).rename("Actual").reset_index()
+
+    violations = groups.merge(required, on=["EP", "Trimester"])
+    violations = violations.merge(actual, on=["Group", "Course", "Type"], how="left")
+    violations["Actual"] = violations["Actual"].fillna(0).astype(int)
+    violations = violations[violations["Actual"] < violations["Required"]]
+    if violations.empty:
+        return None
+    violations = violations.sort_values(["group_order", "row_order", "type_order"], kind="stable")
+    violations["Missing"] = violations["Required"] - violations["Actual"]
+
+    violation_df = violations[["Group", "EP", "Trimester", "Course", "Type", "Required", "Actual", "Missing"]]
+    violation_df = violation_df.reset_index(drop=True)
+    violation_df.index += 1
+    violation_df.reset_index(inplace=True)
+    violation_df.rename(columns={"index": "No"}, inplace=True)
+    return violation_df.to_html(index=False, classes="table table-bordered table-striped table-hover")
 
 def check_conflicts_and_violations(timetable, timetable_name, ga_input_file):
     # Conflict analysis
@@ -46,61 +151,7 @@ def check_conflicts_and_violations(timetable, timetable_name, ga_input_file):
         conflict_table = None
 
     # Violation analysis
-    violation_table = None
-    if ga_input_file:
-        trimester_match = re.search(r'T(\d+)', timetable_name)
-        if trimester_match:
-            trimester_base = int(trimester_match.group(1))
-            xls = pd.ExcelFile(ga_input_file)
-            all_sheets = xls.sheet_names
-
-            def get_ep(g): return g.split("-")[0].upper()
-            def map_trimester(base, year):
-                m = {1: {1:1, 2:2, 3:3}, 2: {1:4, 2:5, 3:6}, 3:{1:7, 2:8}}
-                return m.get(year, {}).get(base)
-
-            group_course_type_count = defaultdict(lambda: defaultdict(lambda: defaultdict(int)))
-            for group, sessions in timetable.items():
-                for s in sessions:
-                    group_course_type_count[group][s["course"].strip().lower()][s["type"].strip().lower()] += 10
-
-            violations = []
-            for group in timetable:
-                ep = get_ep(group)
-                year_code = int(group.split("-")[1][:2])
-                year = 1 if year_code == 23 else 2 if year_code == 22 else 3
-                actual_trim = map_trimester(trimester_base, year)
-                if not actual_trim or actual_trim == 9 or ep not in all_sheets:
-                    continue
-                df = xls.parse(ep)
-                df.columns = [c.lower().strip() for c in df.columns]
-                if 'trimester' not in df.columns:
-                    continue
-                df = df[df['trimester'] == actual_trim]
-                df['course_name'] = df['course_name'].astype(str).str.strip().str.lower()
-
-                for _, row in df.iterrows():
-                    cname = row['course_name']
-                    if not cname or cname == 'nan':
-                        continue
-                    for typ in ['lecture', 'practice', 'lab']:
-                        sc = f"{typ}_slots"
-                        if not pd.isna(row.get(sc)) and int(row[sc]) > 0:
-                            req = int(row[sc])
-                            act = group_course_type_count[group][cname][typ]
-                            if act < req:
-                                violations.append({
-                                    "Group": group, "EP": ep, "Trimester": actual_trim,
-                                    "Course": cname, "Type": typ,
-                                    "Required": req, "Actual": act, "Missing": req - act
-                                })
-
-            violation_df = pd.DataFrame(violations)
-            if not violation_df.empty:
-                violation_df.index += 1
-                violation_df.reset_index(inplace=True)
-                violation_df.rename(columns={"index": "No"}, inplace=True)
-                violation_table = violation_df.to_html(index=False, classes="table table-bordered table-striped table-hover")
+    violation_table = _violation_table(timetable, timetable_name, ga_input_file)
 
     return conflict_table, violation_table
 
@@ -186,60 +237,6 @@ def advanced_conflict_and_violation_analysis(timetable, timetable_name, ga_input
         conflict_table = None
 
     # --- Use your old GA_Input violation logic as before ---
-    violation_table = None
-    if ga_input_file:
-        trimester_match = re.search(r'T(\d+)', timetable_name)
-        if trimester_match:
-            trimester_base = int(trimester_match.group(1))
-            xls = pd.ExcelFile(ga_input_file)
-            all_sheets = xls.sheet_names
-
-            def get_ep(g): return g.split("-")[0].upper()
-            def map_trimester(base, year):
-                m = {1: {1:1, 2:2, 3:3}, 2: {1:4, 2:5, 3:6}, 3:{1:7, 2:8}}
-                return m.get(year, {}).get(base)
-
-            group_course_type_count = defaultdict(lambda: defaultdict(lambda: defaultdict(int)))
-            for group, sessions in timetable.items():
-                for s in sessions:
-                    group_course_type_count[group][s["course"].strip().lower()][s["type"].strip().lower()] += 10
-
-            violations = []
-            for group in timetable:
-                ep = get_ep(group)
-                year_code = int(group.split("-")[1][:2])
-                year = 1 if year_code == 23 else 2 if year_code == 22 else 3
-                actual_trim = map_trimester(trimester_base, year)
-                if not actual_trim or actual_trim == 9 or ep not in all_sheets:
-                    continue
-                df = xls.parse(ep)
-                df.columns = [c.lower().strip() for c in df.columns]
-                if 'trimester' not in df.columns:
-                    continue
-                df = df[df['trimester'] == actual_trim]
-                df['course_name'] = df['course_name'].astype(str).str.strip().str.lower()
-
-                for _, row in df.iterrows():
-                    cname = row['course_name']
-                    if not cname or cname == 'nan':
-                        continue
-                    for typ in ['lecture', 'practice', 'lab']:
-                        sc = f"{typ}_slots"
-                        if not pd.isna(row.get(sc)) and int(row[sc]) > 0:
-                            req = int(row[sc])
-                            act = group_course_type_count[group][cname][typ]
-                            if act < req:
-                                violations.append({
-                                    "Group": group, "EP": ep, "Trimester": actual_trim,
-                                    "Course": cname, "Type": typ,
-                                    "Required": req, "Actual": act, "Missing": req - act
-                                })
-
-            violation_df = pd.DataFrame(violations)
-            if not violation_df.empty:
-                violation_df.index += 1
-                violation_df.reset_index(inplace=True)
-                violation_df.rename(columns={"index": "No"}, inplace=True)
-                violation_table = violation_df.to_html(index=False, classes="table table-bordered table-striped table-hover")
+    violation_table = _violation_table(timetable, timetable_name, ga_input_file)
 
     return conflict_table, violation_table
@@ -0,0 +1,147 @@
+# benchmarks/run.py
+"""
+Scheduler benchmark on synthetic instances. For every scale and seed it times raw-gene
+extraction, initial population, a scalar evaluate_fitness of the best schedule, one
+evolve_population generation and both exporters, and writes wall time, peak traced memory
+and best fitness to a JSON file so runs can be compared between commits:
+
+    python -m benchmarks.run --scales small medium --seeds 0 1 2
+"""
+
+import os
+import sys
+import json
+import time
+import random
+import platform
+import argparse
+import datetime
+import tempfile
+import subprocess
+import tracemalloc
+import numpy as np
+import scripts.config as config
+from benchmarks.synthetic import SCALES, make_workbook, make_joint_lectures
+from scripts.data_loader import preprocess_data, extract_raw_genes
+from scripts.encoding import SessionTable
+from scripts.evaluator import evaluate_fitness
+from scripts.scheduler import generate_initial_population, evolve_population
+from scripts.exporter import export_to_json, export_to_excel
+
+RESULTS_DIR = os.path.join(os.path.dirname(__file__), "results")
+
+
+class Phase:
+    """Times one benchmark phase and, when tracing memory, records its allocation peak."""
+
+    def __init__(self, phases, name, trace):
+        self.phases, self.name, self.trace = phases, name, trace
+
+    def __enter__(self):
+        if self.trace:
+            tracemalloc.reset_peak()
+            self.base = tracemalloc.get_traced_memory()[0]
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        result = {"seconds": round(time.perf_counter() - self.start, 4)}
+        if self.trace:
+            result["peak_mb"] = round((tracemalloc.get_traced_memory()[1] - self.base) / 2 ** 20, 2)
+        self.phases[self.name] = result
+
+
+def _commit():
+    try:
+        out = subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True)
+        return out.stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run_case(scale, seed, workdir, trimester=1, trace=True):
+    params = SCALES[scale]
+    path = make_workbook(os.path.join(workdir, f"{scale}_{seed}.xlsx"), seed=seed, **params)
+    data = preprocess_data(path)
+    rooms = data["rooms"]["Room"].tolist()
+    random.seed(seed)
+
+    phases = {}
+    with Phase(phases, "extract_raw_genes", trace):
+        raw_genes = make_joint_lectures(extract_raw_genes(data["groups"], data["courses"], trimester),
+                                        params["joint"])
+    table = SessionTable(raw_genes, rooms)
+    with Phase(phases, "generate_initial_population", trace):
+        population, _ = generate_initial_population(None, rooms, table=table)
+    initial_best = min(population, key=lambda c: c.fitness)
+    with Phase(phases, "evaluate_fitness", trace):
+        scalar_fitness = evaluate_fitness(initial_best.genes)
+    with Phase(phases, "evolve_population", trace):
+        population, _ = evolve_population(population, rooms)
+    best = min(population, key=lambda c: c.fitness)
+    with Phase(phases, "export_to_json", trace):
+        export_to_json(best, os.path.join(workdir, "schedule.json"))
+    with Phase(phases, "export_to_excel", trace):
+        export_to_excel(best, os.path.join(workdir, "schedule.xlsx"))
+
+    return {
+        "scale": scale,
+        "seed": seed,
+        "instance": dict(params, sessions=table.size),
+        "phases": phases,
+        "best_fitness": {"initial": initial_best.fitness, "generation_1": best.fitness},
+        "evaluators_agree": scalar_fitness == initial_best.fitness,
+    }
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Benchmark the scheduler on synthetic instances")
+    parser.add_argument("--scales", nargs="+", choices=list(SCALES), default=["small", "medium"],
+                        help="instance sizes to run (default: small medium)")
+    parser.add_argument("--seeds", nargs="+", type=int, default=[0, 1, 2], help="seeds per scale (default: 0 1 2)")
+    parser.add_argument("--trimester", type=int, default=1, help="trimester to schedule (default: 1)")
+    parser.add_argument("--no-memory", action="store_true",
+                        help="skip tracemalloc (its overhead slows the Python-heavy phases)")
+    parser.add_argument("--out", help="results file (default: benchmarks/results/<time>_<commit>.json)")
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    trace = not args.no_memory
+    commit = _commit()
+    settings = {name: getattr(config, name) for name in (
+        "POPULATION_SIZE", "CROSSOVER_RATE", "MUTATION_RATE", "SELECTION", "ELITISM", "REPAIR_RATE")}
+    results = []
+    if trace:
+        tracemalloc.start()
+    with tempfile.TemporaryDirectory() as workdir:
+        for scale in args.scales:
+            for seed in args.seeds:
+                case = run_case(scale, seed, workdir, args.trimester, trace)
+                results.append(case)
+                timings = ", ".join(f"{name} {p['seconds']:.2f}s" for name, p in case["phases"].items())
+                print(f"{scale} seed {seed}: {case['instance']['sessions']} sessions | {timings} | "
+                      f"best {case['best_fitness']['generation_1']}")
+    if trace:
+        tracemalloc.stop()
+
+    stamp = datetime.datetime.now()
+    out = args.out or os.path.join(RESULTS_DIR, f"{stamp:%Y%m%d_%H%M%S}_{commit or 'nogit'}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(out)), exist_ok=True)
+    with open(out, "w") as f:
+        json.dump({
+            "commit": commit,
+            "created": stamp.isoformat(timespec="seconds"),
+            "python": sys.version.split()[0],
+            "numpy": np.__version__,
+            "platform": platform.platform(),
+            "memory_traced": trace,
+            "settings": settings,
+            "results": results,
+        }, f, indent=2)
+    print(f"Results written to {out}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,116 @@
+# benchmarks/synthetic.py
+
+import random
+import pandas as pd
+from scripts.config import CURRENT_YEAR
+
+# Instance sizes used by the benchmark harness
+SCALES = {
+    "small": {"groups": 30, "eps": 3, "rooms": 25, "joint": 3},
+    "medium": {"groups": 120, "eps": 6, "rooms": 60, "joint": 4},
+    "large": {"groups": 300, "eps": 12, "rooms": 120, "joint": 5},
+}
+
+CURRICULUM_COLUMNS = ["course_name", "trimester", "credits", "lecture_slots", "practice_slots",
+                      "lab_slots", "delivery_mode", "lecture_precedes_practice"]
+
+# General courses every programme takes in its first year, as in the real template
+GENERAL_COURSES = [
+    ("Foreign Language 1", 1, None, 50, None, "offline"),
+    ("Information and Communication Technologies", 1, 30, 20, None, "online"),
+    ("Physical Education", 1, None, 20, None, "offline"),
+    ("Cultural Studies", 2, 10, 10, None, "online"),
+    ("Physical Education 2", 2, None, 20, None, "offline"),
+    ("History of Kazakhstan", 3, 20, 30, None, "online"),
+]
+
+
+def _ep_names(count):
+    # "EPA", "EPB", ... then "EPAA", ... (letters only, so get_group_info parses them)
+    names = []
+    for i in range(count):
+        name, i = "", i + 1
+        while i:
+            i, r = divmod(i - 1, 26)
+            name = chr(ord("A") + r) + name
+        names.append("EP" + name)
+    return names
+
+
+def _curriculum(ep, rng, courses_per_trimester):
+    rows = [(name, trimester, 5, lecture, practice, lab, mode, True)
+            for name, trimester, lecture, practice, lab, mode in GENERAL_COURSES]
+    for trimester in range(1, 10):
+        general = sum(1 for c in GENERAL_COURSES if c[1] == trimester)
+        for k in range(courses_per_trimester - general):
+            lecture = rng.choice([10, 20, 30])
+            practice = rng.choice([None, 10, 20])
+            lab = rng.choice([None, None, 10])
+            name = f"{ep} Course {trimester}.{k + 1}"
+            if trimester > 3 and k == 0:
+                # Elective pair: the two options share a slot and need one room each
+                name = f"{ep} Elective {trimester}A/{ep} Elective {trimester}B"
+                lab = None
+            mode = "online" if rng.random() < 0.2 else "offline"
+            rows.append((name, trimester, 5, lecture, practice, lab, mode, True))
+    return pd.DataFrame(rows, columns=CURRICULUM_COLUMNS)
+
+
+def make_workbook(path, groups=30, eps=3, rooms=25, courses_per_trimester=5, seed=0, **_):
+    """
+    Write a synthetic input workbook in the GA_input.xlsx schema: a Groups sheet, a Rooms
+    sheet and one curriculum sheet per EP. Groups are spread over the EPs and the three
+    study years; more groups per EP and year means more candidates for joint lectures.
+    """
+    rng = random.Random(seed)
+    ep_names = _ep_names(eps)
+
+    group_rows, numbers = [], {}
+    for i in range(groups):
+        ep = ep_names[i % eps]
+        year = (i // eps) % 3 + 1
+        admitted = CURRENT_YEAR - year - 2000
+        numbers[ep, year] = numbers.get((ep, year), 0) + 1
+        group_rows.append((f"{ep}-{admitted:02d}{numbers[ep, year]:02d}", 5.0, year, rng.randint(15, 30)))
+    groups_df = pd.DataFrame(group_rows, columns=["Group", "department", "year", "headcount"])
+
+    room_rows = []
+    for i in range(rooms):
+        floor = i % 4 + 1
+        room_rows.append((f"C1.{floor}.{100 + i}", rng.choice([30, 60, 90, 120]), "L", True, floor))
+    rooms_df = pd.DataFrame(room_rows, columns=["Room", "capacity", "room_type", "available", "floor"])
+
+    with pd.ExcelWriter(path, engine="openpyxl") as writer:
+        for ep in ep_names:
+            _curriculum(ep, rng, courses_per_trimester).to_excel(writer, sheet_name=ep, index=False)
+        groups_df.to_excel(writer, sheet_name="Groups", index=False)
+        rooms_df.to_excel(writer, sheet_name="Rooms", index=False)
+    return path
+
+
+def make_joint_lectures(raw_genes, size):
+    """
+    Merge lecture genes of the same course, EP and study year (the joint lecture key) into
+    batches of up to `size` groups, as "joint_groups" raw genes. The workbook schema has no
+    joint lectures of its own, so the harness builds them here.
+    """
+    from scripts.groups import get_group_info
+    if size <= 1:
+        return list(raw_genes)
+    merged, open_batches = [], {}
+    for gene in raw_genes:
+        if gene["type"] != "Lecture":
+            merged.append(gene)
+            continue
+        info = get_group_info(gene["group"])
+        # The n-th lecture of a course for a group joins the n-th lecture of its peers
+        key = (gene["course"], info.ep, info.study_year)
+        batches = open_batches.setdefault(key, {})
+        occurrence = sum(1 for b in batches.values() if gene["group"] in b["joint_groups"])
+        batch = batches.get(occurrence)
+        if batch is None or len(batch["joint_groups"]) >= size:
+            batch = {"joint_groups": [], "course": gene["course"], "type": "Lecture"}
+            batches[occurrence] = batch
+            merged.append(batch)
+        batch["joint_groups"].append(gene["group"])
+    return merged
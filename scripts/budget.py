@@ -0,0 +1,48 @@
+# scripts/budget.py
+
+import math
+import time
+from scripts.config import GENERATIONS, EARLY_STOP_GENERATIONS
+
+class Budget:
+    """
+    When a run stops evolving. By default after GENERATIONS generations or
+    EARLY_STOP_GENERATIONS without improvement; with a time budget (seconds) the run is
+    "anytime" instead: it evolves until the next generation would overrun the budget, however
+    many generations that takes. Reaching target_fitness stops either mode. A resumed run
+    passes the seconds it already spent, so the budget covers the whole run.
+    """
+
+    def __init__(self, time_budget=None, target_fitness=None, spent=0.0):
+        if time_budget is not None and not (math.isfinite(time_budget) and time_budget > 0):
+            raise ValueError(f"time_budget must be a positive number of seconds, not {time_budget!r}")
+        self.time_budget = time_budget
+        self.target_fitness = target_fitness
+        self.started = time.time() - spent
+        self.deadline = None if time_budget is None else self.started + time_budget
+        self.reason = None
+
+    @property
+    def used(self):
+        return time.time() - self.started
+
+    def stop(self, generation, stagnant, best_fitness, last_generation=0.0):
+        """Why the run should stop before the next generation (also kept in .reason), or None."""
+        if self.target_fitness is not None and best_fitness <= self.target_fitness:
+            self.reason = "target_fitness"
+        elif self.deadline is not None:
+            if time.time() + last_generation > self.deadline:
+                self.reason = "time_budget"
+        elif generation >= GENERATIONS:
+            self.reason = "generations"
+        elif stagnant >= EARLY_STOP_GENERATIONS:
+            self.reason = "early_stop"
+        return self.reason
+
+    def summary(self):
+        return {
+            "stop_reason": self.reason,
+            "time_budget": self.time_budget,
+            "target_fitness": self.target_fitness,
+            "budget_used": round(self.used, 3),
+        }
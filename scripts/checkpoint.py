@@ -0,0 +1,86 @@
+# scripts/checkpoint.py
+
+import os
+import random
+import hashlib
+import numpy as np
+from scripts.chromosome import Chromosome
+
+def table_fingerprint(table):
+    """Hash of the sessions a table schedules; a checkpoint only resumes onto the same sessions."""
+    digest = hashlib.sha256()
+    for array in (table.group, table.course, table.type, table.online):
+        digest.update(array.tobytes())
+    digest.update("\0".join(table.groups + table.courses + table.types).encode())
+    if table.previous is not None:  # a warm start changes fitness through the deviation penalty
+        for array in table.previous:
+            digest.update(array.tobytes())
+        digest.update(str(table.deviation_penalty).encode())
+    return digest.hexdigest()
+
+
+def save_checkpoint(path, table, population, best_schedule, state):
+    """
+    Write the run state to a compressed .npz: the encoded population and fitness values,
+    the best schedule, the random module state and the counters in `state` (generation,
+    stagnant, best_fitness, progress, elapsed). Written to a temporary file first, so a
+    run killed mid-write leaves the previous checkpoint intact.
+    """
+    version, internal, gauss_next = random.getstate()
+    folder = os.path.dirname(path)
+    if folder:
+        os.makedirs(folder, exist_ok=True)
+    with open(path + ".tmp", "wb") as f:
+        np.savez_compressed(
+            f,
+            fingerprint=np.array(table_fingerprint(table)),
+            rooms=np.array(table.rooms, dtype=str),
+            day=np.stack([c.day for c in population]),
+            slot=np.stack([c.slot for c in population]),
+            room=np.stack([c.room for c in population]),
+            fitness=np.array([c.fitness for c in population], dtype=np.int64),
+            best=np.stack([best_schedule.day.astype(np.int32), best_schedule.slot.astype(np.int32),
+                           best_schedule.room.astype(np.int32)]),
+            best_fitness=np.array(best_schedule.fitness, dtype=np.int64),
+            random_state=np.array(internal, dtype=np.uint64),
+            random_version=np.array(version),
+            random_gauss=np.array(np.nan if gauss_next is None else gauss_next),
+            generation=np.array(state["generation"]),
+            stagnant=np.array(state["stagnant"]),
+            progress=np.array(state["progress"], dtype=np.int64),
+            elapsed=np.array(state["elapsed"], dtype=np.float64),
+        )
+    os.replace(path + ".tmp", path)
+
+
+def load_checkpoint(path, table):
+    """
+    Read a checkpoint written by save_checkpoint for the same sessions. Restores the random
+    module state and returns (population, best_schedule, state).
+    """
+    with np.load(path) as data:
+        if str(data["fingerprint"]) != table_fingerprint(table):
+            raise ValueError(f"Checkpoint {path} was written for a different input or trimester")
+        # Room ids are positions in the saved run's room list; map them onto this table's
+        mapping = np.array([table.room_id(name) for name in data["rooms"].tolist()], dtype=np.int32)
+        day, slot, room = data["day"], data["slot"], mapping[data["room"]]
+        population = []
+        for i, fitness in enumerate(data["fitness"].tolist()):
+            chromosome = Chromosome(table, day[i], slot[i], room[i])
+            chromosome.fitness = fitness
+            population.append(chromosome)
+        best_day, best_slot, best_room = data["best"]
+        best_schedule = Chromosome(table, best_day.astype(day.dtype), best_slot.astype(slot.dtype),
+                                   mapping[best_room])
+        best_schedule.fitness = int(data["best_fitness"])
+
+        gauss_next = float(data["random_gauss"])
+        random.setstate((int(data["random_version"]), tuple(data["random_state"].tolist()),
+                         None if np.isnan(gauss_next) else gauss_next))
+        state = {
+            "generation": int(data["generation"]),
+            "stagnant": int(data["stagnant"]),
+            "progress": data["progress"].tolist(),
+            "elapsed": float(data["elapsed"]),
+        }
+    return population, best_schedule, state
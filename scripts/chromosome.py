@@ -1,42 +1,104 @@
 # scripts/chromosome.py
 
 import random
-from typing import List
-from copy import deepcopy
-from scripts.gene import Gene
-from scripts.evaluator import evaluate_fitness
+import hashlib
+import numpy as np
+from scripts.encoding import SessionTable
 
 class Chromosome:
-    def __init__(self, genes: List[Gene]):
-        self.genes = genes  # list of Gene objects
+    def __init__(self, table: SessionTable, day, slot, room):
+        self.table = table  # static session metadata shared by the whole population
+        self.day = day      # day index per session
+        self.slot = slot    # time slot index per session
+        self.room = room    # room index per session
+        self.fitness = None  # scored in batches by calculate_population_fitness
+        self.shared = set()  # arrays still shared with a copy (copy-on-write)
+        self.hash = None     # cached genome_hash(), cleared whenever a gene changes
+
+    def __len__(self):
+        return self.table.size
+
+    # Decoded Gene objects, only needed for export and validation
+    @property
+    def genes(self):
+        return self.table.decode(self.day, self.slot, self.room)
+
+    # Fitness is unknown (needs scoring) until evaluated or looked up by genome hash
+    @property
+    def dirty(self):
+        return self.fitness is None
+
+    # Structural hash of the day/slot/room arrays, used as the fitness cache key
+    def genome_hash(self):
+        if self.hash is None:
+            digest = hashlib.blake2b(digest_size=16)
+            for array in (self.day, self.slot, self.room):
+                digest.update(array.tobytes())
+            self.hash = digest.digest()
+        return self.hash
+
+    # Take a private copy of a shared array before writing to it
+    def _own(self, name):
+        if name in self.shared:
+            setattr(self, name, getattr(self, name).copy())
+            self.shared.discard(name)
+
+    # Move one session; the chromosome needs scoring again afterwards
+    def update_gene(self, index, day=None, slot=None, room=None):
+        # Re-choosing the current value is a no-op and leaves the chromosome clean
+        if day is not None and self.day[index] == day:
+            day = None
+        if slot is not None and self.slot[index] == slot:
+            slot = None
+        if room is not None and self.room[index] == room:
+            room = None
+        if day is None and slot is None and room is None:
+            return
+        self.hash = None
+        for name, value in (("day", day), ("slot", slot), ("room", room)):
+            if value is not None:
+                self._own(name)
+        if day is not None:
+            self.day[index] = day
+        if slot is not None:
+            self.slot[index] = slot
+        if room is not None:
+            self.room[index] = room
         self.fitness = None
 
-    # Evaluate fitness score using constraint logic
-    def calculate_fitness(self):
-        self.fitness = evaluate_fitness(self.genes)
-        return self.fitness
+    # Copy-on-write copy: both chromosomes share the arrays until one of them writes
+    def copy(self) -> 'Chromosome':
+        child = Chromosome(self.table, self.day, self.slot, self.room)
+        child.fitness = self.fitness
+        child.hash = self.hash
+        child.shared = {"day", "slot", "room"}
+        self.shared = {"day", "slot", "room"}
+        return child
 
-    # Randomly mutate a gene's time, day, or room
-    def mutate(self, timeslots, days, rooms):
-        gene = random.choice(self.genes)
-        if "physical education" in gene.course.lower() or gene.course.strip().upper() == "PE":
+    # Randomly mutate a session's time, day, or room (all given as table indices)
+    def mutate(self, timeslots, days, rooms, index=None):
+        if index is None:
+            index = random.randrange(len(self))
+        if self.table.is_pe[index]:
             attr = random.choice(["time", "day"])  # can't change room
         else:
             attr = random.choice(["time", "day", "room"])
-        # Choose which attribute to mutate
-        attr = random.choice(["time", "day", "room"])
         if attr == "time":
-            gene.time = random.choice(timeslots)
+            self.update_gene(index, slot=random.choice(timeslots))
         elif attr == "day":
-            gene.day = random.choice(days)
+            self.update_gene(index, day=random.choice(days))
         elif attr == "room":
-            gene.room = random.choice(rooms)
+            self.update_gene(index, room=random.choice(rooms))
 
     # One-point crossover to create a new offspring
     def crossover(self, other: 'Chromosome') -> 'Chromosome':
-        point = random.randint(1, len(self.genes) - 1)
-        child_genes = self.genes[:point] + other.genes[point:]
-        return Chromosome(deepcopy(child_genes))
+        point = random.randint(1, len(self) - 1)
+        return Chromosome(
+            self.table,
+            np.concatenate((self.day[:point], other.day[point:])),
+            np.concatenate((self.slot[:point], other.slot[point:])),
+            np.concatenate((self.room[:point], other.room[point:]))
+        )
 
     def __str__(self):
         sorted_genes = sorted(self.genes, key=lambda g: (g.group, g.day, g.time))
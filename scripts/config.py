@@ -5,10 +5,72 @@ import os
 
 POPULATION_SIZE = 100     
 GENERATIONS = 100         
-MUTATION_RATE = 0.15      
+MUTATION_RATE = 0.5       # chance that a child gets its one-session mutation (1.0 = every child)
 CROSSOVER_RATE = 0.85    
 EARLY_STOP_GENERATIONS = 10
 
+# Anytime mode: with a time budget (seconds) a run evolves until the budget is spent instead
+# of for GENERATIONS, without stopping early; a run also stops once its best fitness reaches
+# TARGET_FITNESS (None = off). Web-app jobs may ask for at most MAX_TIME_BUDGET.
+TIME_BUDGET = None
+TARGET_FITNESS = None
+MAX_TIME_BUDGET = 3600
+
+# Warm start from a previous schedule.json: penalty per session moved away from its previous
+# day/slot/room (0 = kept sessions only seed the population and may move freely)
+DEVIATION_PENALTY = 0
+
+# Generations between checkpoints of a run started with a checkpoint path (resumable with --resume)
+CHECKPOINT_INTERVAL = 10
+
+# Parent selection: "tournament" (best of TOURNAMENT_SIZE random picks), "rank" (linear
+# rank weights) or "uniform"; ELITISM best chromosomes are copied unchanged into each generation
+SELECTION = "tournament"
+TOURNAMENT_SIZE = 3
+ELITISM = 2
+
+# Local repair: share of children whose hard conflicts are repaired after mutation, and how
+# many conflicting sessions one repair may move to a clash-free cell. Repaired children give the
+# best schedule per generation but rarely repeat a cached genome; under a short TIME_BUDGET a
+# lower rate buys more, cheaper generations
+REPAIR_RATE = 1.0
+REPAIR_MOVES = 5
+
+# Fitness of recently seen genomes, by genome hash (entries per run)
+FITNESS_CACHE_SIZE = 10000
+
+# Run report extras: a cProfile summary and the traced peak memory (both slow a run down)
+PROFILE_RUNS = False
+TRACE_MEMORY = False
+
+# Seed for random (None = different schedule every run); part of the result cache key
+RANDOM_SEED = None
+
+# Worker processes for population building and evolution (1 = run in the main process)
+WORKERS = 1
+
+# Island model: independent populations in separate processes (1 = single population)
+ISLANDS = 1
+MIGRATION_INTERVAL = 10   # generations between migrations
+MIGRANTS = 2              # best chromosomes sent to the next island
+
+# Schedule generation jobs the web app runs at the same time (others wait in a queue)
+JOB_WORKERS = 1
+
+# Schedule JSON indentation (None = compact, 2 = pretty-printed)
+JSON_INDENT = None
+
+# Finished web-app results, reused when the same workbook/trimester/settings come back
+RESULT_CACHE_DIR = "outputs/cache"
+RESULT_CACHE_MAX_MB = 500
+
+# Parsed input workbooks (pickled sheets by content hash)
+INPUT_CACHE_DIR = "outputs/input_cache"
+INPUT_CACHE_MAX_FILES = 20
+
+# Placement attempts for a joint batch that has no common free slot (each places one subgroup)
+BATCH_SPLIT_ATTEMPTS = 5
+
 INPUT_FILE = "inputs/Input_File_Template.xlsx"
 def get_output_paths(trimester: int):
     now = datetime.datetime.now()
@@ -30,6 +92,13 @@ UPPER_YEAR_TIMESLOTS = [
     f"{hour:02d}:00" for hour in range(8, 20)  
 ]
 
+# Every start time a gene can hold (online lectures run until 21:00)
+TIMESLOTS = [
+    f"{hour:02d}:00" for hour in range(8, 22)
+]
+
+ONLINE_LECTURE_SLOTS = ["18:00", "19:00", "20:00", "21:00"]
+
 DAYS = ["Mon", "Tue", "Wed", "Thu", "Fri", "Sat"]
 
 GROUP_YEAR_DAYS = {
@@ -1,28 +1,27 @@
 # scripts/data_loader.py
 
+import numpy as np
 import pandas as pd
 from scripts.config import (
-    INPUT_FILE, EXCLUDED_COURSES, EXCLUDED_ROOMS, CURRENT_YEAR
+    INPUT_FILE, EXCLUDED_COURSES, EXCLUDED_ROOMS
 )
+from scripts.groups import get_group_info
+from scripts.input_cache import load_sheets
 
-def load_excel_data():
-    """Load all relevant sheets from GA_input.xlsx"""
-    xl = pd.ExcelFile(INPUT_FILE)
-    sheets = {sheet_name: xl.parse(sheet_name) for sheet_name in xl.sheet_names}
-    return sheets
+def load_excel_data(input_file=None):
+    """Load all relevant sheets from GA_input.xlsx (parsed once per file contents)"""
+    return load_sheets(input_file or INPUT_FILE)
 
 def determine_group_year(group_name: str) -> int:
     """Infer year of the group from its name like 'IT-2201'"""
     try:
-        admission_year = int(group_name.split("-")[1][:2]) + 2000
-        study_year = CURRENT_YEAR - admission_year + 1
-        return study_year
+        return get_group_info(group_name).study_year
     except Exception:
         return -1  # fallback if parsing fails
 
-def preprocess_data():
-    """Load, filter, and structure input data"""
-    data = load_excel_data()
+def preprocess_data(input_file=None):
+    """Load, filter, and structure input data (config.INPUT_FILE unless a path is given)"""
+    data = load_excel_data(input_file)
 
     groups_df = data.get("Groups")
     curriculum_sheets = []
@@ -64,60 +63,66 @@ def preprocess_data():
         "instructors": instructors_df
     }
 
-def extract_raw_genes(groups_df, courses_df, trimester):
+def extract_raw_genes(groups_df, courses_df, trimester, verbose=False):
     """
     Extracts initial raw genes (events) for the GA, grouped by group and trimester logic.
+    Groups are joined to their EP's courses for the matching curriculum trimester, and every
+    course expands into slots_per_week genes per session type (same order as the old loops).
     """
-    raw_genes = []
-
     group_name_col = [c for c in groups_df.columns if "group" in c.lower()][0]
     course_name_col = "course_name"
     trimester_col = [c for c in courses_df.columns if "trimester" in c.lower()][0]
-
-    def get_ep_from_group(group_name):
-        return str(group_name).split('-')[0]
-
-    def get_admission_year(group_name):
-        return int(group_name.split("-")[1][:2]) + 2000
-
-    for _, group_row in groups_df.iterrows():
-        group_name = group_row[group_name_col]
-        ep = get_ep_from_group(group_name).upper().strip()
-        admission_year = get_admission_year(group_name)
-        study_year = CURRENT_YEAR - admission_year  # <-- important logic fix
-
-        curriculum_trimester = (study_year) * 3 + trimester - 3
+    types = ["Lecture", "Practice", "Lab"]
+    type_to_column = {
+        "Lecture": "lecture_slots",
+        "Practice": "practice_slots",
+        "Lab": "lab_slots"
+    }
+    weeks_per_trimester = 10
+
+    group_names = groups_df[group_name_col].tolist()
+    infos = [get_group_info(name) for name in group_names]
+    groups = pd.DataFrame({
+        "group": group_names,
+        "EP": [info.ep for info in infos],
+        "study_year": [info.study_year for info in infos],
         # (study_year = 1) => 1st year: trimester 1,2,3
         # (study_year = 2) => 2nd year: trimester 4,5,6
         # (study_year = 3) => 3rd year: trimester 7,8,9
-
-        ep_courses = courses_df[
-            (courses_df["EP"] == ep) &
-            (courses_df[trimester_col] == curriculum_trimester)
-        ]
-
-        print(f"Group: {group_name} | EP: {ep} | Study year: {study_year+1} | Curriculum trimester: {curriculum_trimester} | Courses: {len(ep_courses)}")
-
-        type_to_column = {
-            "Lecture": "lecture_slots",
-            "Practice": "practice_slots",
-            "Lab": "lab_slots"
-        }
-        weeks_per_trimester = 10
-
-        for _, course_row in ep_courses.iterrows():
-            course = course_row[course_name_col]
-            for typ in ["Lecture", "Practice", "Lab"]:
-                slots_col = type_to_column[typ]
-                total_slots = int(course_row[slots_col]) if slots_col in course_row and pd.notnull(course_row[slots_col]) else 0
-                if total_slots == 0:
-                    continue
-                slots_per_week = total_slots // weeks_per_trimester
-                for _ in range(slots_per_week):
-                    raw_genes.append({
-                        "group": group_name,
-                        "course": course,
-                        "type": typ
-                    })
-
-    return raw_genes
+        "curriculum_trimester": [info.study_year * 3 + trimester - 3 for info in infos],
+        "group_order": range(len(group_names)),
+    })
+
+    courses = pd.DataFrame({
+        "EP": courses_df["EP"].to_numpy(),
+        "curriculum_trimester": courses_df[trimester_col].to_numpy(),
+        "course": courses_df[course_name_col].to_numpy(),
+        "course_order": range(len(courses_df)),
+    })
+    for typ in types:
+        column = type_to_column[typ]
+        total = pd.to_numeric(courses_df[column], errors="coerce") if column in courses_df else 0
+        courses[typ] = (pd.Series(total, index=courses_df.index).fillna(0).to_numpy() // 1 // weeks_per_trimester).astype(int)
+
+    sessions = groups.merge(courses, on=["EP", "curriculum_trimester"], how="inner")
+    sessions = sessions.sort_values(["group_order", "course_order"], kind="stable")
+
+    if verbose:
+        counts = sessions["group_order"].value_counts()
+        for row in groups.itertuples():
+            print(f"Group: {row.group} | EP: {row.EP} | Study year: {row.study_year} | "
+                  f"Curriculum trimester: {row.curriculum_trimester} | Courses: {counts.get(row.group_order, 0)}")
+
+    # Expand (session row, type) pairs by their weekly slot count, row-major as before
+    repeats = sessions[types].to_numpy().clip(min=0).ravel()
+    rows = np.repeat(np.arange(len(sessions)), len(types))[repeats > 0]
+    kinds = np.tile(np.arange(len(types)), len(sessions))[repeats > 0]
+    repeats = repeats[repeats > 0]
+    group_col = np.repeat(sessions["group"].to_numpy()[rows], repeats)
+    course_col = np.repeat(sessions["course"].to_numpy()[rows], repeats)
+    type_col = np.repeat(np.array(types, dtype=object)[kinds], repeats)
+
+    return [
+        {"group": group, "course": course, "type": typ}
+        for group, course, typ in zip(group_col.tolist(), course_col.tolist(), type_col.tolist())
+    ]
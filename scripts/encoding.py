@@ -0,0 +1,201 @@
+# scripts/encoding.py
+
+import numpy as np
+from scripts.gene import Gene
+from scripts.groups import get_group_info
+from scripts.config import DAYS, TIMESLOTS, ONLINE_LECTURE_SLOTS
+
+DAY_INDEX = {day: i for i, day in enumerate(DAYS)}
+SLOT_INDEX = {time: i for i, time in enumerate(TIMESLOTS)}
+LATE_SLOTS = [SLOT_INDEX[t] for t in ["18:00", "19:00", "20:00"]]
+
+
+def get_gene_group(gene_data):
+    if "joint_groups" in gene_data:
+        return gene_data["joint_groups"][0]
+    return gene_data["group"]
+
+
+def is_physical_education(course):
+    return "physical education" in course.lower() or course.strip().upper() == "PE"
+
+
+def _slot_penalty_matrix(online_lecture, info):
+    """Day/time range penalty for every (day, slot) cell, as in evaluate_fitness."""
+    matrix = np.zeros((len(DAYS), len(TIMESLOTS)), dtype=np.int32)
+    for d in range(len(DAYS)):
+        for s in range(len(TIMESLOTS)):
+            if online_lecture:
+                matrix[d, s] = 0 if s in LATE_SLOTS else 1000
+            else:
+                matrix[d, s] = 100 * (d not in info.day_indices) + 100 * (s not in info.slot_indices)
+    return matrix
+
+
+class SessionTable:
+    """
+    Static metadata of every session of a run (one entry per group/course/type occurrence).
+    Chromosomes only hold day, slot and room indices into this table; strings are decoded
+    back into Gene objects at export time.
+    """
+
+    def __init__(self, raw_genes, rooms):
+        self.groups, self.group_index = [], {}
+        self.courses, self.course_index = [], {}
+        self.types, self.type_index = [], {}
+        self.rooms, self.room_index = [], {}   # room strings, including "A,B" elective combinations
+        self.room_is_gym = []
+        self.room_members = []  # room ids every room string occupies ("A,B" -> ids of A and B)
+        self._member_array = np.empty((0, 1), dtype=np.intp)
+
+        for room in rooms:
+            self.room_id(room)
+        self.base_rooms = np.array([self.room_index[r] for r in rooms], dtype=np.int32)
+        self.gym_room = self.room_id("Gym")
+        self.online_room = self.room_id("Online")
+
+        # Joint batches are kept together so construction can place them as one unit
+        self.batches = []
+        group, course, typ, online, room_count = [], [], [], [], []
+        for gene_data in sorted(raw_genes, key=get_gene_group):
+            groups = gene_data.get("joint_groups", [gene_data.get("group")])
+            delivery_mode = gene_data.get("delivery_mode", "offline")
+            is_online = delivery_mode == "online" and gene_data["type"].lower() == "lecture"
+            indices = []
+            for g in groups:
+                indices.append(len(group))
+                group.append(self._intern(g, self.groups, self.group_index))
+                course.append(self._intern(gene_data["course"], self.courses, self.course_index))
+                typ.append(self._intern(gene_data["type"], self.types, self.type_index))
+                online.append(is_online)
+                room_count.append(gene_data["course"].count("/") + 1)
+            self.batches.append({
+                "groups": list(groups),
+                "course": gene_data["course"],
+                "type": gene_data["type"],
+                "delivery_mode": delivery_mode,
+                "joint": "joint_groups" in gene_data,
+                "sessions": indices,
+            })
+
+        self.size = len(group)
+        self.group = np.array(group, dtype=np.int32)
+        self.course = np.array(course, dtype=np.int32)
+        self.type = np.array(typ, dtype=np.int8)
+        self.online = np.array(online, dtype=bool)
+        self.room_count = np.array(room_count, dtype=np.int8)
+
+        type_names = [t.lower() for t in self.types]
+        self.is_lecture = np.array([type_names[t] == "lecture" for t in typ], dtype=bool)
+        self.is_practice = np.array([type_names[t] == "practice" for t in typ], dtype=bool)
+        self.is_pe = np.array([is_physical_education(self.courses[c]) for c in course], dtype=bool)
+
+        # Per-group metadata: study year and allowed day/slot indices for mutation
+        self.group_info = [get_group_info(g) for g in self.groups]
+        self.group_year = [info.study_year for info in self.group_info]
+        self.group_days = [list(info.day_indices) for info in self.group_info]
+        self.group_slots = [list(info.slot_indices) for info in self.group_info]
+        self.online_slots = [SLOT_INDEX[t] for t in ONLINE_LECTURE_SLOTS]
+
+        # Joint-lecture key (course, type, EP, study year) and slot-penalty profile per session
+        joint_index, profile_index, profiles = {}, {}, []
+        joint, profile = [], []
+        for i in range(self.size):
+            info = self.group_info[group[i]]
+            key = (course[i], typ[i], info.ep, info.study_year)
+            joint.append(joint_index.setdefault(key, len(joint_index)))
+            key = (online[i], info.study_year)
+            if key not in profile_index:
+                profile_index[key] = len(profiles)
+                profiles.append(_slot_penalty_matrix(online[i], info))
+            profile.append(profile_index[key])
+        self.joint = np.array(joint, dtype=np.int32)
+        self.profile = np.array(profile, dtype=np.int16)
+        self.slot_penalty = np.stack(profiles) if profiles else np.zeros((0, len(DAYS), len(TIMESLOTS)), dtype=np.int32)
+
+        # --- PRACTICE BEFORE LECTURE (by course): fixed by the session order ---
+        self.order_penalty = 0
+        seen_lectures = set()
+        for i in range(self.size):
+            tag = (group[i], course[i])
+            if self.is_lecture[i]:
+                seen_lectures.add(tag)
+            elif self.is_practice[i] and tag not in seen_lectures:
+                self.order_penalty += 10
+
+        # Warm start: placement of every session in a previous timetable (-1 = new session)
+        self.previous = None
+        self.deviation_penalty = 0
+
+    @staticmethod
+    def _intern(value, values, index):
+        if value not in index:
+            index[value] = len(values)
+            values.append(value)
+        return index[value]
+
+    def room_id(self, room):
+        """Index of a room string, registering new elective combinations on the fly."""
+        if room not in self.room_index:
+            self.room_is_gym.append(room.strip().lower() == "gym")
+            parts = room.split(",")
+            self.room_members.append([self.room_index[p] for p in parts if p in self.room_index]
+                                     if len(parts) > 1 else [len(self.rooms)])
+        return self._intern(room, self.rooms, self.room_index)
+
+    def member_array(self):
+        """room_members as one array per room id, padded with -1 (extended as rooms are added)."""
+        known = len(self._member_array)
+        if known < len(self.room_members):
+            new = self.room_members[known:]
+            width = max(self._member_array.shape[1], max(map(len, new)))
+            array = np.full((len(self.room_members), width), -1, dtype=np.intp)
+            array[:known, :self._member_array.shape[1]] = self._member_array
+            for k, members in enumerate(new, known):
+                array[k, :len(members)] = members
+            self._member_array = array
+        return self._member_array
+
+    def sync_rooms(self, rooms):
+        """Reset the room vocabulary to `rooms` (used to keep worker processes in step)."""
+        if self.rooms == rooms:
+            return
+        self.rooms, self.room_index, self.room_is_gym, self.room_members = [], {}, [], []
+        self._member_array = np.empty((0, 1), dtype=np.intp)
+        for room in rooms:
+            self.room_id(room)
+
+    def set_previous(self, day, slot, room, deviation_penalty=0):
+        """
+        Start construction from a previous timetable's day/slot/room arrays (-1 for sessions
+        it did not have). Every session moved away from its previous placement costs
+        deviation_penalty.
+        """
+        self.previous = (day, slot, room)
+        self.deviation_penalty = deviation_penalty
+
+    def empty_arrays(self):
+        """Day/slot/room arrays with every session unplaced (-1)."""
+        return (np.full(self.size, -1, dtype=np.int8),
+                np.full(self.size, -1, dtype=np.int8),
+                np.full(self.size, -1, dtype=np.int32))
+
+    def decode(self, day, slot, room, indices=None):
+        """Build Gene views for the given index arrays (only the sessions in `indices`, if given)."""
+        genes = []
+        if indices is None:
+            indices = slice(None)
+        columns = zip(self.group[indices].tolist(), self.course[indices].tolist(), self.type[indices].tolist(),
+                      self.online[indices].tolist(), day[indices].tolist(), slot[indices].tolist(),
+                      room[indices].tolist())
+        for g, c, t, online, d, s, r in columns:
+            genes.append(Gene(
+                group=self.groups[g],
+                course=self.courses[c],
+                type=self.types[t],
+                day=DAYS[d],
+                time=TIMESLOTS[s],
+                room=self.rooms[r],
+                delivery_mode="online" if online else "offline"
+            ))
+        return genes
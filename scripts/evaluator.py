@@ -1,5 +1,7 @@
+import numpy as np
 from collections import defaultdict
-from scripts.config import GROUP_YEAR_DAYS, FIRST_YEAR_TIMESLOTS, UPPER_YEAR_TIMESLOTS
+from scripts.encoding import LATE_SLOTS
+from scripts.groups import get_group_info
 
 def evaluate_fitness(genes):
     hard_penalty = 0
@@ -8,6 +10,7 @@ def evaluate_fitness(genes):
     group_schedule = defaultdict(list)
     room_schedule = defaultdict(list)
     group_day_slots = defaultdict(lambda: defaultdict(list))
+    group_day_offline = defaultdict(list)  # (group, day) -> offline start times, for the gap term
 
     for g in genes:
         key_time = (g.day, g.time)
@@ -18,11 +21,9 @@ def evaluate_fitness(genes):
         group_day_slots[g.group][g.day].append(g.time)
 
         # --- Time range and slot validation ---
-        year = int(g.group.split("-")[1][:2])
-        admission_year = 2000 + year
-        study_year = 2024 - admission_year
-        allowed_days = GROUP_YEAR_DAYS.get(study_year, [])
-        allowed_slots = FIRST_YEAR_TIMESLOTS if study_year == 1 else UPPER_YEAR_TIMESLOTS
+        info = get_group_info(g.group)
+        allowed_days = info.days
+        allowed_slots = info.slots
 
         # Online lecture can only be at 18:00, 19:00, or 20:00
         if getattr(g, "delivery_mode", "offline") == "online" and g.type.lower() == "lecture":
@@ -37,6 +38,7 @@ def evaluate_fitness(genes):
         # Only add offline to room_schedule (room conflicts)
         if getattr(g, "delivery_mode", "offline") != "online":
             room_schedule[key_room].append(g)
+            group_day_offline[(g.group, g.day)].append(g.time)
 
     # --- ROOM CONFLICTS: ignore online, check offline as before ---
     for key, val in room_schedule.items():
@@ -53,11 +55,8 @@ def evaluate_fitness(genes):
         all_lectures = all(g.type.lower() == "lecture" for g in val)
         joint_keys = set()
         for g in val:
-            ep = g.group.split("-")[0].upper()
-            year_num = int(g.group.split("-")[1][:2])
-            admission_year = 2000 + year_num
-            study_year = 2024 - admission_year
-            joint_keys.add((g.course, g.type, ep, study_year))
+            info = get_group_info(g.group)
+            joint_keys.add((g.course, g.type, info.ep, info.study_year))
 
         # Allow joint lectures (<=5 groups for same course/EP/year/type)
         if all_lectures and len(joint_keys) == 1:
@@ -97,11 +96,7 @@ def evaluate_fitness(genes):
     # --- SOFT: Gaps in group schedule per day (offline sessions only) ---
     for group, days in group_day_slots.items():
         for day, times in days.items():
-            offline_times = [
-                g.time for g in genes
-                if g.group == group and g.day == day and getattr(g, "delivery_mode", "offline") != "online"
-            ]
-            offline_times_sorted = sorted(offline_times)
+            offline_times_sorted = sorted(group_day_offline[(group, day)])
             gaps = 0
             for i in range(1, len(offline_times_sorted)):
                 prev = int(offline_times_sorted[i - 1][:2])
@@ -111,3 +106,117 @@ def evaluate_fitness(genes):
             soft_penalty += gaps * 100
 
     return hard_penalty + soft_penalty
+
+
+def _distinct_per_row(keys, valid=None):
+    """Number of distinct keys in every row of a 2-D array (ignoring cells where valid is False)."""
+    if valid is not None:
+        keys = np.where(valid, keys, -1)
+    keys = np.sort(keys, axis=1)
+    new = np.ones(keys.shape, dtype=bool)
+    new[:, 1:] = keys[:, 1:] != keys[:, :-1]
+    if valid is not None:
+        new &= keys >= 0
+    return new.sum(axis=1)
+
+
+def evaluate_population(table, day, slot, room):
+    """
+    Score a whole population at once. day/slot/room are (population, sessions) index
+    arrays over the same SessionTable; returns the evaluate_fitness penalty of every row.
+    """
+    day = day.astype(np.int64)
+    slot = slot.astype(np.int64)
+    room = room.astype(np.int64)
+    pop_size, n_sessions = day.shape
+    n_days = table.slot_penalty.shape[1]
+    n_slots = table.slot_penalty.shape[2]
+    rows = np.broadcast_to(np.arange(pop_size)[:, None], day.shape)
+    group = np.broadcast_to(table.group[None, :].astype(np.int64), day.shape)
+    fitness = np.full(pop_size, table.order_penalty, dtype=np.int64)
+
+    # --- Time range and slot validation ---
+    fitness += table.slot_penalty[table.profile[None, :], day, slot].sum(axis=1)
+
+    # --- GROUP CONFLICTS: online & offline ---
+    group_keys = (group * n_days + day) * n_slots + slot
+    fitness += 1000 * (n_sessions - _distinct_per_row(group_keys))
+
+    # --- At most one session per group per day at 18:00, 19:00 or 20:00 ---
+    late = np.isin(slot, LATE_SLOTS)
+    late_distinct = _distinct_per_row(group * n_days + day, late)
+    fitness += 1000 * (late.sum(axis=1) - late_distinct)
+
+    # --- ROOM CONFLICTS: offline only, joint lecture (<=5) and Gym exceptions ---
+    offline = ~table.online[None, :] & np.ones(day.shape, dtype=bool)
+    room_is_gym = np.array(table.room_is_gym, dtype=bool)
+    cells = len(table.rooms) * n_days * n_slots
+    keys = (rows * cells + (room * n_days + day) * n_slots + slot)[offline]
+    bucket_keys, bucket = np.unique(keys, return_inverse=True)
+    n = np.bincount(bucket)
+    non_lectures = np.bincount(bucket, weights=~np.broadcast_to(table.is_lecture, day.shape)[offline])
+    gym = room_is_gym[(bucket_keys % cells) // (n_days * n_slots)]
+    in_gym = room_is_gym[room[offline]] & np.broadcast_to(table.is_pe, day.shape)[offline]
+    non_pe = np.bincount(bucket, weights=~in_gym)
+    joint_pairs = np.unique(bucket * (int(table.joint.max(initial=0)) + 1) +
+                            np.broadcast_to(table.joint, day.shape)[offline])
+    joint = np.bincount(joint_pairs // (int(table.joint.max(initial=0)) + 1), minlength=len(n))
+    penalty = np.where((non_lectures == 0) & (joint == 1), np.maximum(n - 5, 0), n - 1) * 1000
+    penalty[(non_pe == 0) & gym] = 0
+    fitness += np.bincount(bucket_keys // cells, weights=penalty, minlength=pop_size).astype(np.int64)
+
+    # --- SOFT: Gaps in group schedule per day (offline sessions only) ---
+    day_keys = (rows * len(table.groups) + group) * n_days + day
+    pairs = np.unique((day_keys * n_slots + slot)[offline])
+    pair_day, pair_slot = pairs // n_slots, pairs % n_slots
+    same_day = pair_day[1:] == pair_day[:-1]
+    gaps = np.where(same_day, pair_slot[1:] - pair_slot[:-1] - 1, 0)
+    pair_row = pair_day[1:] // (len(table.groups) * n_days)
+    fitness += 100 * np.bincount(pair_row, weights=gaps, minlength=pop_size).astype(np.int64)
+
+    # --- Sessions moved away from their warm-start placement ---
+    if table.deviation_penalty:
+        prev_day, prev_slot, prev_room = table.previous
+        moved = (day != prev_day) | (slot != prev_slot) | (room != prev_room)
+        fitness += table.deviation_penalty * (moved & (prev_day >= 0)).sum(axis=1)
+
+    return fitness
+
+
+def find_conflicts(table, day, slot, room):
+    """
+    Hard-constraint view of one chromosome: a mask of the sessions that cost a hard penalty
+    (outside their allowed day/slot, or sharing a group slot, a group's evening or a room),
+    and how many sessions each session's room cell may hold (5 for joint lectures, 1 otherwise).
+    """
+    day = day.astype(np.int64)
+    slot = slot.astype(np.int64)
+    room = room.astype(np.int64)
+    n_days = table.slot_penalty.shape[1]
+    n_slots = table.slot_penalty.shape[2]
+    group = table.group.astype(np.int64)
+    conflicted = table.slot_penalty[table.profile, day, slot] > 0
+
+    _, inverse, counts = np.unique((group * n_days + day) * n_slots + slot,
+                                   return_inverse=True, return_counts=True)
+    conflicted |= counts[inverse] > 1
+
+    late = np.isin(slot, LATE_SLOTS)
+    _, inverse, counts = np.unique(group[late] * n_days + day[late], return_inverse=True, return_counts=True)
+    conflicted[late] |= counts[inverse] > 1
+
+    # Room cells, with the same joint lecture and Gym exceptions as evaluate_population
+    room_limit = np.full(table.size, table.size, dtype=np.int64)
+    offline = ~table.online
+    room_is_gym = np.array(table.room_is_gym, dtype=bool)[room[offline]]
+    keys = (room[offline] * n_days + day[offline]) * n_slots + slot[offline]
+    _, bucket, n = np.unique(keys, return_inverse=True, return_counts=True)
+    non_lectures = np.bincount(bucket, weights=~table.is_lecture[offline])
+    non_pe = np.bincount(bucket, weights=~(room_is_gym & table.is_pe[offline]))
+    width = int(table.joint.max(initial=0)) + 1
+    joint = np.bincount(np.unique(bucket * width + table.joint[offline]) // width, minlength=len(n))
+    limit = np.where((non_lectures == 0) & (joint == 1), 5, 1)[bucket]
+    limit[(non_pe[bucket] == 0) & room_is_gym] = table.size
+    room_limit[offline] = limit
+    conflicted[offline] |= n[bucket] > limit
+    return conflicted, room_limit
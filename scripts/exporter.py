@@ -1,10 +1,13 @@
-import json
-import pandas as pd
+import numpy as np
 from pathlib import Path
-from openpyxl.styles import Font, Alignment, PatternFill, Border, Side
+from openpyxl.styles import Font, Alignment, PatternFill, Border, Side, NamedStyle
+from itertools import groupby
 from openpyxl.utils import get_column_letter
-from openpyxl import load_workbook
+from openpyxl import Workbook
+from openpyxl.cell import WriteOnlyCell
 import os
+from scripts.config import JSON_INDENT
+from scripts.schedule_json import write_schedule
 
 def is_physical_education(course_name):
     name = str(course_name).lower().strip()
@@ -12,19 +15,25 @@ def is_physical_education(course_name):
 
 def export_schedule(chromosome, json_path, excel_path):
     # Assign Gym or Online for appropriate events
-    for gene in chromosome.genes:
-        if is_physical_education(gene.course):
-            gene.room = "Gym"
-        if getattr(gene, "delivery_mode", "offline") == "online" and gene.type.lower() == "lecture":
-            gene.room = "Online"
+    table = chromosome.table
+    room = np.where(table.is_pe, table.gym_room, chromosome.room)
+    chromosome.room = np.where(table.online, table.online_room, room).astype(chromosome.room.dtype)
+    chromosome.shared.discard("room")  # a fresh array, no longer shared with any copy
+    chromosome.hash = None  # the genome changed, as after update_gene
     export_to_json(chromosome, json_path)
     export_to_excel(chromosome, excel_path)
 
-def export_to_json(chromosome, path):
-    os.makedirs(os.path.dirname(path), exist_ok=True)
-    data = chromosome.to_json()
-    for group_name in data:
-        for entry in data[group_name]:
+def _json_groups(chromosome):
+    # (group, sessions) pairs in to_json order, decoding one group at a time
+    table = chromosome.table
+    order = np.argsort(table.group, kind="stable")  # group ids follow first appearance
+    bounds = np.flatnonzero(np.diff(table.group[order])) + 1
+    for indices in np.split(order, bounds):
+        if not len(indices):
+            continue
+        genes = table.decode(chromosome.day, chromosome.slot, chromosome.room, indices)
+        sessions = sorted((gene.to_dict() for gene in genes), key=lambda x: (x["day"], x["time"]))
+        for entry in sessions:
             course_name = entry.get("Course", "")
             if is_physical_education(course_name):
                 entry["Room"] = "Gym"
@@ -32,108 +41,115 @@ def export_to_json(chromosome, path):
                 entry["Room"] = "Online"
             if "Instructor" in entry:
                 del entry["Instructor"]
-    with open(path, "w", encoding="utf-8") as f:
-        json.dump(data, f, ensure_ascii=False, indent=2)
+        yield genes[0].group, sessions
 
-def export_to_excel(chromosome, path):
-    thin_border = Border(
-        left=Side(style='thin'), right=Side(style='thin'),
-        top=Side(style='thin'), bottom=Side(style='thin')
-    )
-    header_fill = PatternFill(start_color="C0C0C0", end_color="C0C0C0", fill_type="solid")
+def export_to_json(chromosome, path, indent=JSON_INDENT):
+    # Streamed group by group; compact unless config.JSON_INDENT (or indent) asks for pretty output
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    write_schedule(_json_groups(chromosome), path, indent)
 
-    rows = []
-    for gene in sorted(chromosome.genes, key=lambda g: (g.group, g.day, g.time)):
+DAY_ORDER = ["Mon", "Tue", "Wed", "Thu", "Fri", "Sat"]
+EXCEL_HEADERS = ["Day of the week", "Time", "Discipline", "Classroom", "Type", "Lecturer"]
+
+def _excel_sheets(chromosome):
+    # {group: [row values in EXCEL_HEADERS order]}, groups and rows in sheet order
+    day_rank = {day: i for i, day in enumerate(DAY_ORDER)}
+    sheets = {}
+    for gene in sorted(chromosome.genes, key=lambda g: (g.group, day_rank.get(g.day, len(DAY_ORDER)), g.time)):
         if getattr(gene, "delivery_mode", "offline") == "online" and gene.type.lower() == "lecture":
             room = "Online"
         elif is_physical_education(gene.course):
             room = "Gym"
         else:
             room = gene.room
-        rows.append({
-            "Group": gene.group,
-            "Day of the week": gene.day,
-            "Time": gene.time,
-            "Discipline": gene.course,
-            "Classroom": room,
-            "Type": gene.type,
-            "Lecturer": getattr(gene, "instructor", "")
-        })
-
-    df = pd.DataFrame(rows)
-    writer = pd.ExcelWriter(path, engine="openpyxl")
-    Path(path).parent.mkdir(parents=True, exist_ok=True)
+        sheets.setdefault(gene.group, []).append([
+            gene.day,
+            gene.time,
+            gene.course.replace('/', '\n').replace(',', '\n'),
+            room.replace('/', '\n').replace(',', '\n'),
+            gene.type,
+            getattr(gene, "instructor", "") or None
+        ])
+    return sheets
 
-    DAY_ORDER = ["Mon", "Tue", "Wed", "Thu", "Fri", "Sat"]
+def export_to_excel(chromosome, path):
+    """
+    One formatted sheet per group, streamed row by row through a write-only workbook:
+    title row, grey header, merged day blocks, wrapped cells and the signature line.
+    """
+    thin = Side(style='thin')
+    thin_border = Border(left=thin, right=thin, top=thin, bottom=thin)
+    header_fill = PatternFill(start_color="C0C0C0", end_color="C0C0C0", fill_type="solid")
+    title_font = Font(name="Times New Roman", size=12, bold=True)
+    header_font = Font(name="Times New Roman", bold=True, size=7)
+    day_font = Font(name="Times New Roman", size=11)
+    cell_font = Font(name="Times New Roman", size=7)
+    signature_font = Font(name="Times New Roman", size=10)
+    wrapped = Alignment(wrap_text=True, horizontal="center", vertical="top")
+    centered = Alignment(horizontal="center", vertical="center")
+    title_alignment = Alignment(horizontal="center")
+    signature_alignment = Alignment(horizontal="right")
 
-    for group, group_df in df.groupby("Group"):
-        group_df["Day of the week"] = pd.Categorical(group_df["Day of the week"], categories=DAY_ORDER, ordered=True)
-        sheet_df = group_df.sort_values(by=["Day of the week", "Time"])
-        sheet_df.drop(columns=["Group"], inplace=True)
+    Path(path).parent.mkdir(parents=True, exist_ok=True)
+    wb = Workbook(write_only=True)
+
+    # Every cell format is registered once as a named style; cells then only refer to it
+    def named(name, font, alignment, fill=None, border=None):
+        style = NamedStyle(name=name, font=font, alignment=alignment)
+        if fill is not None:
+            style.fill = fill
+        if border is not None:
+            style.border = border
+        wb.add_named_style(style)
+        return name
+
+    title_style = named("Timetable Title", title_font, title_alignment)
+    header_style = named("Timetable Header", header_font, centered, header_fill, thin_border)
+    day_style = named("Timetable Day", day_font, centered, border=thin_border)
+    day_wrapped_style = named("Timetable Day Wrapped", day_font, wrapped, border=thin_border)
+    cell_style = named("Timetable Cell", cell_font, wrapped, border=thin_border)
+    signature_style = named("Timetable Signature", signature_font, signature_alignment)
+
+    def styled(ws, value, style):
+        cell = WriteOnlyCell(ws, value=value)
+        cell.style = style
+        return cell
+    for group, rows in _excel_sheets(chromosome).items():
         sheet_name = group[:31]
-        sheet_df.to_excel(writer, sheet_name=sheet_name, index=False)
-
-    writer.close()
-
-    # === APPLY FORMATTING ===
-    wb = load_workbook(path)
-    for sheet in wb.sheetnames:
-        ws = wb[sheet]
-
-        # Add group title
-        ws.insert_rows(1)
-        ws.insert_rows(2)
-        ws["A1"] = f"Group {sheet}"
-        ws.merge_cells(start_row=1, start_column=1, end_row=1, end_column=6)
-        ws["A1"].font = Font(name="Times New Roman", size=12, bold=True)
-        ws["A1"].alignment = Alignment(horizontal="center")
-
-        # Apply header style
-        for cell in ws[3]:
-            cell.font = Font(name="Times New Roman", bold=True, size=7)
-            cell.alignment = Alignment(horizontal='center', vertical='center')
-            cell.fill = header_fill
-            cell.border = thin_border
-
-        # Group same Day values and format all cells
-        current_day = None
-        start_row = 4
-        for row_idx in range(4, ws.max_row + 1):
-            day_cell = ws.cell(row=row_idx, column=1)
-            is_same_day = (day_cell.value == current_day)
-            if not is_same_day:
-                if current_day is not None:
-                    ws.merge_cells(start_row=start_row, start_column=1, end_row=row_idx - 1, end_column=1)
-                    ws.cell(row=start_row, column=1).alignment = Alignment(horizontal='center', vertical='center')
-                current_day = day_cell.value
-                start_row = row_idx
-
-            for col in range(1, 7):
-                cell = ws.cell(row=row_idx, column=col)
-                if col == 3 or col == 4:  # Discipline or Classroom
-                    if isinstance(cell.value, str):
-                        cell.value = cell.value.replace('/', '\n').replace(',', '\n')
-                font_size = 11 if col == 1 or row_idx == 3 else 7
-                cell.font = Font(name="Times New Roman", size=font_size)
-                cell.alignment = Alignment(wrap_text=True, horizontal="center", vertical="top")
-                cell.border = thin_border
-
-        # Merge final day block
-        if current_day and start_row < ws.max_row:
-            ws.merge_cells(start_row=start_row, start_column=1, end_row=ws.max_row, end_column=1)
-            ws.cell(row=start_row, column=1).alignment = Alignment(horizontal='center', vertical='center')
-
-        # Auto-width
-        for col in ws.columns:
-            max_length = max((len(str(cell.value)) for cell in col if cell.value), default=0)
-            adjusted_length = min(max_length + 2, 30)
-            col_letter = get_column_letter(col[0].column)
-            ws.column_dimensions[col_letter].width = adjusted_length
-
-        # Add director signature line
-        last_row = ws.max_row + 2
-        ws.cell(row=last_row, column=6).value = "Director Of Academic Affairs Department __________"
-        ws.cell(row=last_row, column=6).alignment = Alignment(horizontal="right")
-        ws.cell(row=last_row, column=6).font = Font(name="Times New Roman", size=10)
+        ws = wb.create_sheet(sheet_name)
+        title = f"Group {sheet_name}"
+
+        # Auto-width, from the values before they are written
+        for col, header in enumerate(EXCEL_HEADERS):
+            values = [title] if col == 0 else []
+            values += [header] + [row[col] for row in rows if row[col]]
+            ws.column_dimensions[get_column_letter(col + 1)].width = min(max(len(str(v)) for v in values) + 2, 30)
+
+        # Group title and header
+        ws.append([styled(ws, title, title_style)])
+        ws.merged_cells.add("A1:F1")
+        ws.append([])
+        ws.append([styled(ws, h, header_style) for h in EXCEL_HEADERS])
+
+        # Day blocks: the day is written once and merged over the block's rows
+        row_idx = 4
+        blocks = [(day, sum(1 for _ in block)) for day, block in groupby(row[0] for row in rows)]
+        for block_no, (day, length) in enumerate(blocks):
+            last = block_no == len(blocks) - 1
+            merged = length > 1 or not last
+            if length > 1:
+                ws.merged_cells.add(f"A{row_idx}:A{row_idx + length - 1}")
+            for offset in range(length):
+                row = rows[row_idx - 4 + offset]
+                first = offset == 0
+                cells = [styled(ws, day if first else None, day_style if first and merged else day_wrapped_style)]
+                cells += [styled(ws, value, cell_style) for value in row[1:]]
+                ws.append(cells)
+            row_idx += length
+
+        # Director signature line
+        ws.append([])
+        ws.append([None] * 5 + [styled(ws, "Director Of Academic Affairs Department __________",
+                                       signature_style)])
 
     wb.save(path)
@@ -0,0 +1,39 @@
+# scripts/fitness_cache.py
+
+from collections import OrderedDict
+from scripts.config import FITNESS_CACHE_SIZE
+
+class FitnessCache:
+    """
+    Bounded LRU map from genome hash (Chromosome.genome_hash) to fitness, so identical
+    genomes are scored once per run. Counts hits and lookups for the run statistics.
+    """
+
+    def __init__(self, size=FITNESS_CACHE_SIZE):
+        self.size = size
+        self.entries = OrderedDict()
+        self.hits = 0
+        self.lookups = 0
+
+    def get(self, key):
+        self.lookups += 1
+        fitness = self.entries.get(key)
+        if fitness is not None:
+            self.entries.move_to_end(key)
+            self.hits += 1
+        return fitness
+
+    def put(self, key, fitness):
+        self.entries[key] = fitness
+        self.entries.move_to_end(key)
+        while len(self.entries) > self.size:
+            self.entries.popitem(last=False)
+
+    def count(self, hits, lookups):
+        """Add hit statistics gathered elsewhere (e.g. by a worker process)."""
+        self.hits += hits
+        self.lookups += lookups
+
+    @property
+    def hit_rate(self):
+        return self.hits / self.lookups if self.lookups else 0.0
@@ -1,6 +1,7 @@
 from dataclasses import dataclass
 
-@dataclass
+# Immutable __slots__ record: a decoded, read-only view of one session
+@dataclass(frozen=True, slots=True)
 class Gene:
     group: str
     course: str
@@ -0,0 +1,38 @@
+# scripts/groups.py
+
+from dataclasses import dataclass
+from functools import lru_cache
+from scripts.config import (
+    CURRENT_YEAR, DAYS, TIMESLOTS, GROUP_YEAR_DAYS, FIRST_YEAR_TIMESLOTS, UPPER_YEAR_TIMESLOTS
+)
+
+@dataclass(frozen=True)
+class GroupInfo:
+    name: str
+    ep: str            # educational programme, e.g. "IT" for "IT-2301"
+    study_year: int    # 1 for groups admitted in CURRENT_YEAR - 1, and so on
+    days: tuple        # allowed day names
+    slots: tuple       # allowed start times
+    day_indices: tuple   # positions of `days` in config.DAYS
+    slot_indices: tuple  # positions of `slots` in config.TIMESLOTS
+
+def get_study_year(group_name):
+    """Study year from a group name like 'IT-2301' (admitted 2023 -> 1st year in 2024)."""
+    admission_year = 2000 + int(group_name.split("-")[1][:2])
+    return CURRENT_YEAR - admission_year
+
+@lru_cache(maxsize=None)
+def get_group_info(group_name):
+    """Parsed metadata of a group; computed once per name and shared by every module."""
+    study_year = get_study_year(group_name)
+    days = tuple(GROUP_YEAR_DAYS.get(study_year, []))
+    slots = tuple(FIRST_YEAR_TIMESLOTS if study_year == 1 else UPPER_YEAR_TIMESLOTS)
+    return GroupInfo(
+        name=group_name,
+        ep=group_name.split("-")[0].upper().strip(),
+        study_year=study_year,
+        days=days,
+        slots=slots,
+        day_indices=tuple(DAYS.index(d) for d in days),
+        slot_indices=tuple(TIMESLOTS.index(t) for t in slots),
+    )
@@ -0,0 +1,70 @@
+# scripts/input_cache.py
+
+import io
+import os
+import pickle
+import hashlib
+import threading
+import pandas as pd
+from collections import OrderedDict
+from scripts.config import INPUT_CACHE_DIR, INPUT_CACHE_MAX_FILES
+
+_MEMORY_SLOTS = 4  # parsed workbooks kept in this process
+_memory = OrderedDict()
+_lock = threading.Lock()
+
+
+def _read_bytes(source):
+    # source is a path or an uploaded file object (e.g. Flask's FileStorage)
+    if isinstance(source, (str, os.PathLike)):
+        with open(source, "rb") as f:
+            return f.read()
+    if hasattr(source, "seek"):
+        source.seek(0)
+    return source.read()
+
+
+def _parse(data):
+    xl = pd.ExcelFile(io.BytesIO(data))
+    return {sheet_name: xl.parse(sheet_name) for sheet_name in xl.sheet_names}
+
+
+def _evict_disk():
+    entries = sorted(
+        (e for e in os.scandir(INPUT_CACHE_DIR) if e.name.endswith(".pkl")),
+        key=lambda e: e.stat().st_mtime
+    )
+    for entry in entries[:max(0, len(entries) - INPUT_CACHE_MAX_FILES)]:
+        os.remove(entry.path)
+
+
+def load_sheets(source):
+    """
+    Every sheet of a workbook as {sheet name: DataFrame}, parsed once per file contents.
+    Parsed workbooks are kept in memory and pickled under INPUT_CACHE_DIR by content hash,
+    so re-uploads and repeated runs skip openpyxl. Callers get their own copies.
+    """
+    data = _read_bytes(source)
+    key = hashlib.sha256(data).hexdigest()
+    with _lock:
+        sheets = _memory.get(key)
+        if sheets is not None:
+            _memory.move_to_end(key)
+    if sheets is None:
+        path = os.path.join(INPUT_CACHE_DIR, f"{key}.pkl")
+        try:
+            with open(path, "rb") as f:
+                sheets = pickle.load(f)
+            os.utime(path)
+        except (OSError, pickle.UnpicklingError, EOFError):
+            sheets = _parse(data)
+            os.makedirs(INPUT_CACHE_DIR, exist_ok=True)
+            with open(path + ".tmp", "wb") as f:
+                pickle.dump(sheets, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(path + ".tmp", path)
+            _evict_disk()
+        with _lock:
+            _memory[key] = sheets
+            while len(_memory) > _MEMORY_SLOTS:
+                _memory.popitem(last=False)
+    return {name: df.copy() for name, df in sheets.items()}
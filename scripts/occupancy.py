@@ -0,0 +1,78 @@
+# scripts/occupancy.py
+
+import numpy as np
+from scripts.config import DAYS, TIMESLOTS
+
+class Occupancy:
+    """
+    Room and group occupancy of a batch of chromosomes under construction, kept as boolean
+    (chromosome, ..., day, slot) arrays. "Which rooms are free at (day, slot)" is a mask
+    lookup, and one call places a session in every chromosome of the batch at once.
+    """
+
+    def __init__(self, table, rooms, count, rng):
+        self.table = table
+        self.rng = rng
+        self.room_names = list(rooms)
+        self.room_ids = table.base_rooms  # table room id of every entry of `rooms`
+        self.combinations = {}  # sorted room indices -> table id of the "A,B" room string
+        self.lecture_rooms = np.array([r.strip().lower() != "gym" for r in rooms], dtype=bool)
+        shape = (count, len(DAYS), len(TIMESLOTS))
+        self.room_busy = np.zeros(shape + (len(rooms),), dtype=bool)
+        self.free_rooms = np.full(shape, self.lecture_rooms.sum(), dtype=np.int32)
+        self.group_busy = np.zeros((count, len(table.groups), len(DAYS), len(TIMESLOTS)), dtype=bool)
+
+        # allowed[g] is the (day, slot) mask of cells group g may use
+        self.allowed = np.zeros((len(table.groups), len(DAYS), len(TIMESLOTS)), dtype=bool)
+        for g in range(len(table.groups)):
+            self.allowed[g][np.ix_(table.group_days[g], table.group_slots[g])] = True
+
+    def group_free(self, rows, groups):
+        """(rows, day, slot) mask of cells where none of `groups` has a session yet."""
+        return ~self.group_busy[rows[:, None], np.asarray(groups)[None, :]].any(axis=1)
+
+    def pick_cells(self, ok):
+        """
+        A random True cell of every row of a (rows, ...) mask, as an index tuple over the
+        trailing axes, plus a flag per row telling whether it had any True cell at all.
+        """
+        flat = ok.reshape(len(ok), -1)
+        priority = np.where(flat, self.rng.random(flat.shape, dtype=np.float32), -1.0)
+        return np.unravel_index(priority.argmax(axis=1), ok.shape[1:]), flat.any(axis=1)
+
+    def pick_rooms(self, rows, day, slot, needed):
+        """`needed` random free lecture rooms per row at its (day, slot), as sorted indices into `rooms`."""
+        free = ~self.room_busy[rows, day, slot] & self.lecture_rooms
+        priority = np.where(free, self.rng.random(free.shape, dtype=np.float32), -1.0)
+        # Sorted so the same rooms always make the same "A,B" combination
+        if needed == 1:
+            return priority.argmax(axis=1)[:, None]
+        return np.sort(np.argpartition(-priority, needed - 1, axis=1)[:, :needed], axis=1)
+
+    def room_ids_for(self, room_idx):
+        """Table room id per row; elective combinations are joined as "A,B" like before."""
+        if room_idx.shape[1] == 1:
+            return self.room_ids[room_idx[:, 0]]
+        ids = []
+        for picked in map(tuple, room_idx.tolist()):
+            if picked not in self.combinations:
+                self.combinations[picked] = self.table.room_id(",".join(self.room_names[i] for i in picked))
+            ids.append(self.combinations[picked])
+        return np.array(ids, dtype=self.room_ids.dtype)
+
+    def book(self, rows, groups, day, slot, room_idx=None):
+        self.group_busy[rows[:, None], groups[None, :], day[:, None], slot[:, None]] = True
+        if room_idx is not None:
+            self.room_busy[rows[:, None], day[:, None], slot[:, None], room_idx] = True
+            self.free_rooms[rows, day, slot] -= room_idx.shape[1]
+
+    def book_placed(self, sessions, day, slot, room):
+        """Book sessions that sit in the same (day, slot, room id) cell in every row."""
+        self.group_busy[:, self.table.group[sessions], day, slot] = True
+        position = {room_id: i for i, room_id in enumerate(self.room_ids.tolist())}
+        for d, s, r in set(zip(day.tolist(), slot.tolist(), room.tolist())):
+            # Online and Gym sessions take no lecture room; "A,B" takes both of its rooms
+            taken = [position[m] for m in self.table.room_members[r] if m in position]
+            taken = [i for i in taken if self.lecture_rooms[i] and not self.room_busy[0, d, s, i]]
+            self.room_busy[:, d, s, taken] = True
+            self.free_rooms[:, d, s] -= len(taken)
@@ -0,0 +1,219 @@
+# scripts/parallel.py
+
+import time
+import random
+import numpy as np
+from concurrent.futures import ProcessPoolExecutor
+from scripts.chromosome import Chromosome
+from scripts.fitness_cache import FitnessCache
+from scripts.run_metrics import RunMetrics, NO_METRICS
+from scripts.budget import Budget
+from scripts.config import (
+    POPULATION_SIZE, GENERATIONS, MIGRATION_INTERVAL, MIGRANTS
+)
+
+# Static run data, set once per worker process by _init_worker
+_table = None
+_rooms = None
+_cache = None  # the worker's own fitness cache for this run
+
+def _init_worker(table, rooms):
+    global _table, _rooms, _cache
+    _table = table
+    _rooms = rooms
+    _cache = FitnessCache()
+
+def create_executor(table, rooms, workers):
+    """Process pool whose workers receive the session table and rooms once, at start-up."""
+    return ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(table, rooms))
+
+def _pack(population):
+    return (np.stack([c.day for c in population]),
+            np.stack([c.slot for c in population]),
+            np.stack([c.room for c in population]),
+            np.array([c.fitness for c in population], dtype=np.int64))
+
+def _unpack(table, packed):
+    day, slot, room, fitness = packed
+    population = []
+    for i in range(len(fitness)):
+        chromosome = Chromosome(table, day[i], slot[i], room[i])
+        chromosome.fitness = int(fitness[i])
+        population.append(chromosome)
+    return population
+
+def _chunks(total, workers):
+    size, extra = divmod(total, workers)
+    return [size + (i < extra) for i in range(workers) if size + (i < extra) > 0]
+
+# Elective room combinations ("A,B") are registered while building and repairing chromosomes,
+# so each task starts from the main process' room list and hands back the names it added.
+
+def _initial_task(room_names, count, seed):
+    from scripts.scheduler import generate_initial_population
+    random.seed(seed)
+    _table.sync_rooms(room_names)
+    population, unplaced = generate_initial_population(None, _rooms, table=_table, size=count)
+    return (_pack(population), _table.rooms[len(room_names):]), unplaced
+
+def _cache_counts(hits, lookups):
+    # Fitness cache hits and lookups of the worker since the given counts
+    return _cache.hits - hits, _cache.lookups - lookups
+
+def _evolve_task(room_names, parents, count, seed):
+    from scripts.scheduler import breed_child, calculate_population_fitness, parent_selector
+    random.seed(seed)
+    _table.sync_rooms(room_names)
+    population = _unpack(_table, parents)
+    metrics = RunMetrics()
+    select = parent_selector(population)
+    children = [breed_child(population, select, metrics) for _ in range(count)]
+    counts = _cache.hits, _cache.lookups
+    calculate_population_fitness(children, _cache, metrics)
+    return (_pack(children), _table.rooms[len(room_names):]), _cache_counts(*counts), metrics.snapshot()
+
+def parallel_initial_population(executor, table, size, workers):
+    """The population built in chunks by the workers, and the merged unplaced-batch report."""
+    from scripts.scheduler import merge_unplaced
+    room_names = list(table.rooms)
+    futures = [executor.submit(_initial_task, room_names, count, random.getrandbits(32))
+               for count in _chunks(size, workers)]
+    population, reports = [], []
+    for future in futures:
+        result, unplaced = future.result()
+        population.extend(_merge(table, room_names, result))
+        reports.append(unplaced)
+    return population, merge_unplaced(reports)
+
+def _merge(table, room_names, result):
+    # Map the worker's room ids onto this process' vocabulary
+    (day, slot, room, fitness), new_rooms = result
+    mapping = np.arange(len(room_names) + len(new_rooms), dtype=room.dtype)
+    mapping[len(room_names):] = [table.room_id(name) for name in new_rooms]
+    return _unpack(table, (day, slot, mapping[room], fitness))
+
+def parallel_evolve(executor, population, size, workers, cache=None, metrics=NO_METRICS):
+    # Parents go to each worker once per generation; children come back already scored,
+    # with the workers' phase timings and evaluation counts for `metrics`
+    table = population[0].table
+    room_names = list(table.rooms)
+    parents = _pack(population)
+    futures = [executor.submit(_evolve_task, room_names, parents, count, random.getrandbits(32))
+               for count in _chunks(size, workers)]
+    next_gen = []
+    for future in futures:
+        result, counts, snapshot = future.result()
+        next_gen.extend(_merge(table, room_names, result))
+        metrics.merge(snapshot)
+        if cache is not None:
+            cache.count(*counts)
+    return next_gen
+
+# --- Island model: independent populations that swap their best chromosomes ---
+
+def _island_epoch(room_names, packed, generations, seed, deadline=None, target_fitness=None):
+    # Up to `generations` generations; fewer if the run's deadline or target fitness is reached
+    from scripts.scheduler import evolve_population
+    random.seed(seed)
+    _table.sync_rooms(room_names)
+    population = _unpack(_table, packed)
+    metrics = RunMetrics()
+    progress = []
+    best = None
+    counts = _cache.hits, _cache.lookups
+    last_generation = 0.0
+    for _ in range(generations):
+        if deadline is not None and time.time() + last_generation > deadline:
+            break
+        if target_fitness is not None and best is not None and best.fitness <= target_fitness:
+            break
+        started = time.time()
+        population, generation_best = evolve_population(population, _rooms, cache=_cache, metrics=metrics)
+        last_generation = time.time() - started
+        progress.append(generation_best.fitness)
+        if best is None or generation_best.fitness < best.fitness:
+            best = generation_best
+    if best is None:
+        best = min(population, key=lambda c: c.fitness)
+    new_rooms = _table.rooms[len(room_names):]
+    return ((_pack(population), new_rooms), progress, (_pack([best]), new_rooms), _cache_counts(*counts),
+            metrics.snapshot())
+
+def _migrate(populations):
+    # Ring topology: the best MIGRANTS of island i replace the worst of island i + 1
+    emigrants = [sorted(p, key=lambda c: c.fitness)[:MIGRANTS] for p in populations]
+    for i, population in enumerate(populations):
+        incoming = [c.copy() for c in emigrants[i - 1]]
+        population.sort(key=lambda c: c.fitness)
+        population[len(population) - len(incoming):] = incoming
+
+def run_islands(table, rooms, islands, verbose=True, progress=None, cancel=None, cache=None, metrics=NO_METRICS,
+                budget=None):
+    """Evolve `islands` populations in separate processes, migrating every MIGRATION_INTERVAL generations."""
+    from scripts.scheduler import merge_unplaced, record_unplaced
+    budget = budget or Budget()
+    with create_executor(table, rooms, islands) as executor:
+        room_names = list(table.rooms)
+        with metrics.phase("initial_population"):
+            futures = [executor.submit(_initial_task, room_names, POPULATION_SIZE, random.getrandbits(32))
+                       for _ in range(islands)]
+            results = [f.result() for f in futures]
+            populations = [_merge(table, room_names, result) for result, _ in results]
+        record_unplaced(merge_unplaced([unplaced for _, unplaced in results]), islands * POPULATION_SIZE,
+                        verbose, metrics)
+
+        best_fitness = float("inf")
+        best_schedule = min((c for p in populations for c in p), key=lambda c: c.fitness)
+        stagnant = 0
+        best_fitness_progress = []
+        generation = 0
+        last_generation = 0.0
+        while not budget.stop(generation, stagnant, best_schedule.fitness, last_generation):
+            if cancel is not None and cancel.is_set():
+                budget.reason = "cancelled"
+                break
+            steps = MIGRATION_INTERVAL if budget.deadline is not None else min(MIGRATION_INTERVAL, GENERATIONS - generation)
+            room_names = list(table.rooms)
+            started = time.time()
+            with metrics.phase("island_epochs"):
+                futures = [executor.submit(_island_epoch, room_names, _pack(p), steps, random.getrandbits(32),
+                                           budget.deadline, budget.target_fitness)
+                           for p in populations]
+                results = [f.result() for f in futures]
+            steps = max(len(p) for _, p, _, _, _ in results)
+            if steps == 0:
+                budget.reason = "time_budget"
+                break
+            last_generation = (time.time() - started) / steps
+            metrics.count("generations", steps)
+            populations = [_merge(table, room_names, packed) for packed, _, _, _, _ in results]
+            for *_, counts, snapshot in results:
+                metrics.merge(snapshot)
+                if cache is not None:
+                    cache.count(*counts)
+
+            # Merge the islands' per-generation bests into one progress curve
+            for step in range(steps):
+                fitness = min(p[step] for _, p, _, _, _ in results if step < len(p))
+                if fitness < best_fitness:
+                    best_fitness = fitness
+                    stagnant = 0
+                else:
+                    stagnant += 1
+                best_fitness_progress.append(best_fitness)
+                if progress is not None:
+                    progress(generation + step + 1, best_fitness)
+                if verbose:
+                    print(f"Generation {generation + step + 1} | Best Fitness: {best_fitness}")
+            for _, _, packed, _, _ in results:
+                island_best = _merge(table, room_names, packed)[0]
+                if island_best.fitness < best_schedule.fitness:
+                    best_schedule = island_best
+            generation += steps
+            _migrate(populations)
+
+        if verbose and budget.reason == "early_stop":
+            print("Stopping early due to no improvement.")
+        elif verbose and budget.reason in ("time_budget", "target_fitness"):
+            print(f"Stopped after {generation} generations ({budget.reason}, {budget.used:.1f}s used).")
+    return best_schedule, best_fitness_progress
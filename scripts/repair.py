@@ -0,0 +1,89 @@
+# scripts/repair.py
+
+import random
+import numpy as np
+from scripts.encoding import LATE_SLOTS
+from scripts.evaluator import find_conflicts
+from scripts.config import DAYS, TIMESLOTS, REPAIR_MOVES
+
+def repair(chromosome, moves=REPAIR_MOVES):
+    """
+    Local repair: move up to `moves` sessions that are in a hard conflict to a cell where
+    they clash with nothing (an allowed day/slot where the group is free and, for offline
+    sessions, enough lecture rooms are empty). Returns the number of sessions moved.
+    """
+    table = chromosome.table
+    conflicted, room_limit = find_conflicts(table, chromosome.day, chromosome.slot, chromosome.room)
+    candidates = np.flatnonzero(conflicted)
+    if not len(candidates):
+        return 0
+    # Visit conflicts in random order; stop looking after a few of them found no free cell
+    order = np.random.default_rng(random.getrandbits(64)).permutation(candidates)[:3 * moves]
+
+    # Occupancy index of the chromosome: sessions per group cell, per group evening and per
+    # room cell (rooms in use only); `busy` counts the base rooms taken by offline sessions,
+    # including the rooms inside "A,B" elective combinations
+    day = chromosome.day.astype(np.intp)
+    slot = chromosome.slot.astype(np.intp)
+    room = chromosome.room.astype(np.intp)
+    offline = ~table.online
+    n_days, n_slots = len(DAYS), len(TIMESLOTS)
+    cells = n_days * n_slots
+    group_count = np.bincount((table.group * n_days + day) * n_slots + slot,
+                              minlength=len(table.groups) * cells).reshape(-1, n_days, n_slots)
+    late = np.zeros(n_slots, dtype=bool)
+    late[LATE_SLOTS] = True
+    late_count = group_count[:, :, late].sum(axis=2)
+    used, compact = np.unique(room[offline], return_inverse=True)
+    room_count = np.bincount((compact * n_days + day[offline]) * n_slots + slot[offline],
+                             minlength=len(used) * cells).reshape(-1, n_days, n_slots)
+    used = {r: k for k, r in enumerate(used.tolist())}
+
+    n_base = int(table.base_rooms.max(initial=-1)) + 1
+    member = table.member_array()[room[offline]]
+    cell = np.broadcast_to((day[offline] * n_slots + slot[offline])[:, None], member.shape)
+    keep = (member >= 0) & (member < n_base)
+    busy = np.bincount(member[keep] * cells + cell[keep], minlength=n_base * cells).reshape(-1, n_days, n_slots)
+    lecture_rooms = table.base_rooms[[not table.room_is_gym[r] for r in table.base_rooms.tolist()]]
+
+    def book(i, d, s, r, sign):
+        group_count[table.group[i], d, s] += sign
+        late_count[table.group[i], d] += sign * late[s]
+        if offline[i]:
+            if r in used:
+                room_count[used[r], d, s] += sign
+            member = table.member_array()[r]
+            busy[member[(member >= 0) & (member < n_base)], d, s] += sign
+
+    moved = 0
+    for i in order.tolist():
+        if moved == moves:
+            break
+        g = table.group[i]
+        d, s, r = day[i], slot[i], room[i]
+        # An earlier move may already have resolved this session's conflicts
+        if not (table.slot_penalty[table.profile[i], d, s] > 0 or group_count[g, d, s] > 1
+                or (late[s] and late_count[g, d] > 1) or (offline[i] and room_count[used[r], d, s] > room_limit[i])):
+            continue
+        book(i, d, s, r, -1)
+        ok = (table.slot_penalty[table.profile[i]] == 0) & (group_count[g] == 0)
+        ok &= ~(late[None, :] & (late_count[g] > 0)[:, None])
+        needs_rooms = offline[i] and not table.is_pe[i]
+        if needs_rooms:
+            free = busy[lecture_rooms] == 0
+            ok &= free.sum(axis=0) >= table.room_count[i]
+        found = np.flatnonzero(ok)
+        if not len(found):
+            book(i, d, s, r, 1)
+            continue
+
+        d, s = divmod(random.choice(found.tolist()), n_slots)
+        if needs_rooms:
+            picked = sorted(random.sample(np.flatnonzero(free[:, d, s]).tolist(), int(table.room_count[i])))
+            ids = lecture_rooms[picked]
+            r = int(ids[0]) if len(ids) == 1 else table.room_id(",".join(table.rooms[x] for x in ids))
+        book(i, d, s, r, 1)
+        day[i], slot[i], room[i] = d, s, r
+        chromosome.update_gene(i, day=d, slot=s, room=r if needs_rooms else None)
+        moved += 1
+    return moved
@@ -0,0 +1,104 @@
+# scripts/result_cache.py
+
+import os
+import json
+import shutil
+import hashlib
+import threading
+import scripts.config as config
+
+# Settings that change how a run executes but not what it produces
+_RUNTIME_SETTINGS = {
+    "WORKERS", "JOB_WORKERS", "INPUT_FILE", "RESULT_CACHE_DIR", "RESULT_CACHE_MAX_MB",
+    "INPUT_CACHE_DIR", "INPUT_CACHE_MAX_FILES", "FITNESS_CACHE_SIZE",
+    "PROFILE_RUNS", "TRACE_MEMORY", "CHECKPOINT_INTERVAL", "MAX_TIME_BUDGET",
+}
+
+
+def _settings():
+    """Every result-affecting setting from scripts/config.py, as plain JSON values."""
+    settings = {}
+    for name in sorted(dir(config)):
+        if name.isupper() and name not in _RUNTIME_SETTINGS:
+            value = getattr(config, name)
+            if isinstance(value, (int, float, str, list, tuple, dict, type(None))):
+                settings[name] = value
+    return settings
+
+
+def cache_key(input_path, trimester, seed=None, options=None):
+    """Hash of the workbook contents, trimester, GA settings, seed and per-run options."""
+    digest = hashlib.sha256()
+    with open(input_path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            digest.update(chunk)
+    digest.update(json.dumps({
+        "trimester": int(trimester),
+        "seed": config.RANDOM_SEED if seed is None else seed,
+        "settings": _settings(),
+        "options": options or {},
+    }, sort_keys=True, default=str).encode())
+    return digest.hexdigest()
+
+
+class ResultCache:
+    """
+    Generated schedules stored on disk by cache key: <root>/<key>/ holds schedule.json,
+    schedule.xlsx and metrics.json. Entries are evicted least-recently-used first once the
+    cache grows past max_mb (the directory mtime records the last use).
+    """
+
+    def __init__(self, root=None, max_mb=None):
+        self.root = root or config.RESULT_CACHE_DIR
+        self.max_bytes = (config.RESULT_CACHE_MAX_MB if max_mb is None else max_mb) * 1024 * 1024
+        self.lock = threading.Lock()
+
+    def _entry(self, key):
+        return os.path.join(self.root, key)
+
+    def get(self, key):
+        """Stored result for the key as {"json_path", "excel_path", "metrics"}, or None."""
+        folder = self._entry(key)
+        with self.lock:
+            try:
+                with open(os.path.join(folder, "metrics.json")) as f:
+                    metrics = json.load(f)
+            except (OSError, ValueError):
+                return None
+            os.utime(folder)
+        return {
+            "json_path": os.path.join(folder, "schedule.json"),
+            "excel_path": os.path.join(folder, "schedule.xlsx"),
+            "metrics": metrics,
+        }
+
+    def put(self, key, json_path, excel_path, metrics):
+        """Copy a finished run's outputs into the cache and evict old entries if needed."""
+        folder = self._entry(key)
+        with self.lock:
+            tmp = folder + ".tmp"
+            shutil.rmtree(tmp, ignore_errors=True)
+            os.makedirs(tmp)
+            shutil.copyfile(json_path, os.path.join(tmp, "schedule.json"))
+            shutil.copyfile(excel_path, os.path.join(tmp, "schedule.xlsx"))
+            # metrics.json is written last: its presence marks a complete entry
+            with open(os.path.join(tmp, "metrics.json"), "w") as f:
+                json.dump(metrics, f)
+            shutil.rmtree(folder, ignore_errors=True)
+            os.replace(tmp, folder)
+            self._evict()
+
+    def _evict(self):
+        entries = []
+        for name in os.listdir(self.root):
+            folder = os.path.join(self.root, name)
+            if name.endswith(".tmp") or not os.path.isdir(folder):
+                continue
+            size = sum(e.stat().st_size for e in os.scandir(folder) if e.is_file())
+            entries.append((os.path.getmtime(folder), size, folder))
+        total = sum(size for _, size, _ in entries)
+        for _, size, folder in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            shutil.rmtree(folder, ignore_errors=True)
+            total -= size
@@ -1,23 +1,53 @@
 # scripts/run_generate.py
 import sys
+import json
+import argparse
 from scripts.data_loader import preprocess_data, extract_raw_genes
 from scripts.scheduler import run_scheduler
 from scripts.exporter import export_schedule
-from scripts.config import get_output_paths
+from scripts.run_metrics import RunMetrics
+from scripts.config import get_output_paths, WORKERS, ISLANDS, TIME_BUDGET, TARGET_FITNESS, DEVIATION_PENALTY
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Generate a timetable with the genetic algorithm")
+    parser.add_argument("trimester", type=int, help="trimester to schedule (1-3)")
+    parser.add_argument("--workers", type=int, default=WORKERS,
+                        help=f"worker processes for the GA (default: {WORKERS}, 1 = no pool)")
+    parser.add_argument("--islands", type=int, default=ISLANDS,
+                        help=f"independent populations evolved in parallel (default: {ISLANDS})")
+    parser.add_argument("--time-budget", type=float, default=TIME_BUDGET,
+                        help="evolve for this many seconds instead of a fixed number of generations")
+    parser.add_argument("--target-fitness", type=int, default=TARGET_FITNESS,
+                        help="stop as soon as the best fitness is at or below this value")
+    parser.add_argument("--warm-start", metavar="SCHEDULE_JSON",
+                        help="start from a previously exported schedule.json; only new or changed sessions are placed")
+    parser.add_argument("--deviation-penalty", type=int, default=DEVIATION_PENALTY,
+                        help=f"penalty per warm-start session moved from its previous cell (default: {DEVIATION_PENALTY})")
+    parser.add_argument("--checkpoint", metavar="PATH",
+                        help="save the population to this .npz file every CHECKPOINT_INTERVAL generations")
+    parser.add_argument("--resume", metavar="PATH",
+                        help="continue the run saved in this checkpoint (keeps checkpointing to it)")
+    parser.add_argument("--profile", action="store_true",
+                        help="add a cProfile summary and the peak traced memory to the run report")
+    parser.add_argument("--report", help="write the JSON run report to this file")
+    return parser.parse_args()
 
 def main():
-    if len(sys.argv) < 2:
-        print("Usage: python -m scripts.run_generate <trimester>")
-        sys.exit(1)
-    trimester = int(sys.argv[1])
+    args = parse_args()
+    trimester = args.trimester
+
+    metrics = RunMetrics(profile=args.profile, trace_memory=args.profile)
+    metrics.start()
 
     print(f"Loading data and extracting raw genes for trimester {trimester} ...")
-    data = preprocess_data()
+    with metrics.phase("load"):
+        data = preprocess_data()
     groups_df = data["groups"]
     courses_df = data["courses"]
     rooms_df = data["rooms"]
 
-    raw_genes = extract_raw_genes(groups_df, courses_df, trimester)
+    with metrics.phase("extract"):
+        raw_genes = extract_raw_genes(groups_df, courses_df, trimester, verbose=True)
     print(f"Number of raw genes generated: {len(raw_genes)}")
     if not raw_genes:
         print("❗ No genes were generated. Check your input data for this trimester and year!")
@@ -25,13 +55,37 @@ def main():
 
     valid_rooms = rooms_df["Room"].tolist()
     print("Running scheduler...")
-    best_schedule, fitness_progress = run_scheduler(raw_genes, valid_rooms)
-    print(f"Best fitness found: {best_schedule.fitness}")
+    best_schedule, fitness_progress, run = run_scheduler(
+        raw_genes, valid_rooms, workers=args.workers, islands=args.islands, metrics=metrics,
+        time_budget=args.time_budget, target_fitness=args.target_fitness,
+        checkpoint=args.checkpoint or args.resume, resume=args.resume,
+        warm_start=args.warm_start, deviation_penalty=args.deviation_penalty
+    )
+    print(f"Best fitness found: {best_schedule.fitness} (stopped: {run['stop_reason']}, {run['budget_used']}s)")
 
     json_out, excel_out = get_output_paths(trimester)
-    export_schedule(best_schedule, json_out, excel_out)
+    with metrics.phase("export"):
+        export_schedule(best_schedule, json_out, excel_out)
+    metrics.stop()
     print(f"Schedule generated. Files saved to:\n  Excel: {excel_out}\n  JSON: {json_out}")
 
+    report = metrics.report()
+    print(f"Run time {report['elapsed']}s:")
+    for name, phase in report["phases"].items():
+        print(f"  {name:<20} {phase['seconds']:>9.2f}s  ({phase['calls']} calls)")
+    if "evaluations_per_second" in report:
+        print(f"  {report['evaluations_per_second']} evaluations/s")
+    if run["time_budget"] is not None:
+        print(f"  {run['budget_used']}s of the {run['time_budget']}s budget used ({run['stop_reason']})")
+    if "warm_start" in report:
+        warm = report["warm_start"]
+        print(f"  {warm['kept']} of {warm['sessions']} sessions kept from the warm start, {warm['moved']} moved")
+    if args.profile:
+        print(report["profile"])
+    if args.report:
+        with open(args.report, "w") as f:
+            json.dump(report, f, indent=2)
+
 if __name__ == "__main__":
     main()
 
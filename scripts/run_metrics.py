@@ -0,0 +1,117 @@
+# scripts/run_metrics.py
+
+import io
+import time
+import pstats
+import cProfile
+import tracemalloc
+from contextlib import contextmanager, nullcontext
+
+class RunMetrics:
+    """
+    Structured telemetry of one run: wall time and call count per phase, counters (e.g.
+    evaluations, fitness cache hits) and, optionally, a cProfile summary and the traced
+    peak memory. report() returns it all as plain JSON values. Worker processes record into
+    their own RunMetrics and the run merges their snapshots, so phase seconds of pool and
+    island runs are summed over workers.
+    """
+
+    def __init__(self, profile=False, trace_memory=False):
+        self.phases = {}    # name -> [seconds, calls]
+        self.counters = {}
+        self.values = {}    # other run facts (e.g. why and when the run stopped)
+        self.profiler = cProfile.Profile() if profile else None
+        self.trace_memory = trace_memory
+        self.peak_memory = None
+        self.started = None
+        self.elapsed = None
+
+    @contextmanager
+    def phase(self, name):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            entry = self.phases.setdefault(name, [0.0, 0])
+            entry[0] += time.perf_counter() - start
+            entry[1] += 1
+
+    def count(self, name, amount=1):
+        self.counters[name] = self.counters.get(name, 0) + amount
+
+    def record(self, name, value):
+        self.values[name] = value
+
+    def snapshot(self):
+        """Phase timings and counters as plain values, e.g. to send back from a worker process."""
+        return {"phases": {name: list(entry) for name, entry in self.phases.items()},
+                "counters": dict(self.counters)}
+
+    def merge(self, snapshot):
+        """Add another recorder's snapshot() (a worker's share of the run) to this one."""
+        for name, (seconds, calls) in snapshot["phases"].items():
+            entry = self.phases.setdefault(name, [0.0, 0])
+            entry[0] += seconds
+            entry[1] += calls
+        for name, amount in snapshot["counters"].items():
+            self.count(name, amount)
+
+    def start(self):
+        """Start the run clock and the optional profiler / memory tracing."""
+        self.started = time.perf_counter()
+        if self.trace_memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+        if self.profiler is not None:
+            self.profiler.enable()
+
+    def stop(self):
+        if self.started is None:
+            return
+        if self.profiler is not None:
+            self.profiler.disable()
+        if self.trace_memory and tracemalloc.is_tracing():
+            self.peak_memory = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+        self.elapsed = time.perf_counter() - self.started
+        self.started = None
+
+    def report(self, top=25):
+        """Phases, counters and derived rates as a JSON-serializable dict."""
+        report = {
+            "elapsed": None if self.elapsed is None else round(self.elapsed, 3),
+            "phases": {name: {"seconds": round(seconds, 4), "calls": calls}
+                       for name, (seconds, calls) in self.phases.items()},
+            "counters": dict(self.counters),
+        }
+        report.update(self.values)
+        evaluate = self.phases.get("evaluate")
+        if evaluate and evaluate[0] > 0:
+            report["evaluations_per_second"] = round(self.counters.get("evaluations", 0) / evaluate[0], 1)
+        lookups = self.counters.get("fitness_cache_lookups", 0)
+        if lookups:
+            report["fitness_cache_hit_rate"] = round(self.counters.get("fitness_cache_hits", 0) / lookups, 4)
+        if self.peak_memory is not None:
+            report["peak_memory_mb"] = round(self.peak_memory / 2 ** 20, 2)
+        if self.profiler is not None:
+            out = io.StringIO()
+            pstats.Stats(self.profiler, stream=out).sort_stats("cumulative").print_stats(top)
+            report["profile"] = out.getvalue()
+        return report
+
+
+class _NoMetrics(RunMetrics):
+    # Stand-in used when the caller does not record metrics: every hook is a no-op
+    def phase(self, name):
+        return nullcontext()
+
+    def count(self, name, amount=1):
+        pass
+
+    def record(self, name, value):
+        pass
+
+    def merge(self, snapshot):
+        pass
+
+
+NO_METRICS = _NoMetrics()
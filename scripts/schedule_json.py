@@ -0,0 +1,115 @@
+# scripts/schedule_json.py
+
+import io
+import json
+import codecs
+
+try:  # optional fast backend
+    import orjson
+except ImportError:
+    orjson = None
+
+_decoder = json.JSONDecoder()
+
+
+def dumps(obj, indent=None):
+    """JSON text for obj: compact unless an indent is given; orjson is used when installed."""
+    if orjson is not None and indent in (None, 2):
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2 if indent else 0).decode("utf-8")
+    if indent is None:
+        return json.dumps(obj, ensure_ascii=False, separators=(",", ":"))
+    return json.dumps(obj, ensure_ascii=False, indent=indent)
+
+
+def write_schedule(groups, path, indent=None):
+    """
+    Write a {group: [session, ...]} timetable one group at a time.
+    groups is an iterable of (group, sessions) pairs; the output matches json.dump of the
+    whole dict (with the same indent), without ever holding the whole dict in memory.
+    """
+    pad = "\n" + " " * indent if indent else ""
+    with open(path, "w", encoding="utf-8") as f:
+        f.write("{")
+        empty = True
+        for group, sessions in groups:
+            f.write(("," if not empty else "") + pad)
+            f.write(dumps(group) + (": " if indent else ":"))
+            f.write(dumps(sessions, indent).replace("\n", pad))
+            empty = False
+        f.write("}" if empty or not indent else "\n}")
+
+
+class _Reader:
+    # Text buffer over a file that is topped up as the parser runs out of input
+    def __init__(self, source, chunk_size):
+        self.source = source
+        self.chunk_size = chunk_size
+        self.decoder = codecs.getincrementaldecoder("utf-8")()
+        self.buf, self.pos, self.eof = "", 0, False
+
+    def fill(self, size=None):
+        chunk = self.source.read(size or self.chunk_size)
+        self.eof = not chunk
+        if isinstance(chunk, bytes):
+            chunk = self.decoder.decode(chunk, final=self.eof)
+        self.buf = self.buf[self.pos:] + chunk
+        self.pos = 0
+
+    def peek(self):
+        # Next non-whitespace character ("" at end of input)
+        while True:
+            while self.pos < len(self.buf) and self.buf[self.pos] in " \t\r\n":
+                self.pos += 1
+            if self.pos < len(self.buf) or self.eof:
+                return self.buf[self.pos:self.pos + 1]
+            self.fill()
+
+    def expect(self, char):
+        if self.peek() != char:
+            raise ValueError(f"Invalid schedule JSON: expected {char!r} at offset {self.pos}")
+        self.pos += 1
+
+    def value(self):
+        self.peek()
+        while True:
+            try:
+                value, end = _decoder.raw_decode(self.buf, self.pos)
+                # A value that runs to the end of the buffer may continue in the next chunk
+                if end < len(self.buf) or self.eof:
+                    self.pos = end
+                    return value
+            except json.JSONDecodeError:
+                if self.eof:
+                    raise
+            # Read at least as much again as is pending, so long values take O(log n) retries
+            self.fill(max(self.chunk_size, len(self.buf) - self.pos))
+
+
+def iter_schedule(source, chunk_size=1 << 16):
+    """
+    Yield (group, sessions) pairs from a {group: [session, ...]} JSON timetable.
+    source is a path or a text/binary file object; it is read in chunks, so only one
+    group's sessions are decoded at a time.
+    """
+    if isinstance(source, str):
+        with open(source, "rb") as f:
+            yield from iter_schedule(f, chunk_size)
+        return
+    if isinstance(source, (bytes, bytearray)):
+        source = io.BytesIO(source)
+    reader = _Reader(source, chunk_size)
+    reader.expect("{")
+    if reader.peek() == "}":
+        return
+    while True:
+        group = reader.value()
+        reader.expect(":")
+        yield group, reader.value()
+        if reader.peek() == "}":
+            return
+        reader.expect(",")
+
+
+def load_schedule(source):
+    """The whole timetable as a dict, read with iter_schedule."""
+    return dict(iter_schedule(source))
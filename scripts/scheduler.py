@@ -1,301 +1,392 @@
+import time
 import random
-from copy import deepcopy
-from collections import defaultdict
+import itertools
+import numpy as np
 from scripts.chromosome import Chromosome
-from scripts.gene import Gene
+from scripts.encoding import SessionTable
+from scripts.occupancy import Occupancy
+from scripts.repair import repair
+from scripts.fitness_cache import FitnessCache
+from scripts.run_metrics import NO_METRICS
+from scripts.budget import Budget
+from scripts.checkpoint import save_checkpoint, load_checkpoint
+from scripts.warm_start import previous_placement, moved_sessions
+from scripts.evaluator import evaluate_population
+from scripts.parallel import create_executor, parallel_initial_population, parallel_evolve, run_islands
 from scripts.config import (
-    POPULATION_SIZE, GENERATIONS, CROSSOVER_RATE, MUTATION_RATE,
-    EARLY_STOP_GENERATIONS, FIRST_YEAR_TIMESLOTS,
-    UPPER_YEAR_TIMESLOTS, GROUP_YEAR_DAYS
+    POPULATION_SIZE, CROSSOVER_RATE, MUTATION_RATE, SELECTION, TOURNAMENT_SIZE, ELITISM,
+    REPAIR_RATE, TIME_BUDGET, TARGET_FITNESS, DEVIATION_PENALTY, CHECKPOINT_INTERVAL, WORKERS, ISLANDS, BATCH_SPLIT_ATTEMPTS,
+    RANDOM_SEED, DAYS, TIMESLOTS
 )
-import itertools
 
-def get_valid_slots_for_group(group_name):
-    year = int(group_name.split("-")[1][:2])
-    admission_year = 2000 + year
-    study_year = 2024 - admission_year
-    days = GROUP_YEAR_DAYS.get(study_year, [])
-    if study_year == 1:
-        slots = [f"{hour:02d}:00" for hour in range(8, 14)]
+def _write(schedule, rows, sessions, day, slot, room):
+    # schedule holds the (chromosome, session) day/slot/room arrays of the whole batch
+    for column, values in zip(schedule, (day, slot, room)):
+        column[rows[:, None], sessions] = values[:, None]
+
+def assign_online(occupancy, rows, index, schedule):
+    # For online lecture: first free online slot on a random allowed day, room Online
+    table = occupancy.table
+    group = table.group[index]
+    days = np.zeros(len(DAYS), dtype=bool)
+    days[table.group_days[group] or slice(None)] = True
+    free = occupancy.group_free(rows, [group])[:, :, table.online_slots] & days[None, :, None]
+    (day,), found = occupancy.pick_cells(free.any(axis=2))
+    slot = np.array(table.online_slots)[free[np.arange(len(rows)), day].argmax(axis=1)]
+
+    # If all allowed slots are booked, still assign randomly (will be penalized for conflicts)
+    missing = ~found
+    day[missing] = occupancy.rng.choice(np.flatnonzero(days), missing.sum())
+    slot[missing] = occupancy.rng.choice(table.online_slots, missing.sum())
+
+    occupancy.book(rows, np.array([group]), day, slot)
+    _write(schedule, rows, np.array([index]), day, slot, np.full(len(rows), table.online_room))
+
+def place_at(occupancy, rows, sessions, day, slot, schedule):
+    # Book the sessions of one batch at the given (day, slot) of every row, with free rooms
+    table = occupancy.table
+    if table.is_pe[sessions[0]]:
+        room_idx, room = None, np.full(len(rows), table.gym_room)
     else:
-        slots = [f"{hour:02d}:00" for hour in range(8, 20)]
-    return days, slots
-
-def get_group_ep_year(group_name):
-    ep = group_name.split("-")[0].upper()
-    year_num = int(group_name.split("-")[1][:2])
-    admission_year = 2000 + year_num
-    study_year = 2024 - admission_year
-    return ep, study_year
-
-def get_elective_room_count(course_name):
-    return course_name.count("/") + 1
-
-def try_assign_batch(groups, course, typ, days, slots, rooms, group_used, room_used, genes, delivery_mode="offline"):
-    # Only support offline practices/labs!
-    # For online lecture: assign all to Online, allowed times only
-    if delivery_mode == "online" and typ.lower() == "lecture":
-        online_slots = ["18:00", "19:00", "20:00", "21:00"]
-        for g in groups:
-            assigned = False
-            for day in days:
-                for time in online_slots:
-                    if time not in group_used[g][day]:
-                        genes.append(Gene(
-                            group=g,
-                            course=course,
-                            type=typ,
-                            day=day,
-                            time=time,
-                            room="Online",
-                            delivery_mode="online"
-                        ))
-                        group_used[g][day].add(time)
-                        assigned = True
-                        break
-                if assigned:
-                    break
-            if not assigned:
-                # If all allowed slots are booked, still assign randomly (will be penalized for conflicts)
-                day = random.choice(days)
-                time = random.choice(online_slots)
-                genes.append(Gene(
-                    group=g,
-                    course=course,
-                    type=typ,
-                    day=day,
-                    time=time,
-                    room="Online",
-                    delivery_mode="online"
-                ))
-                group_used[g][day].add(time)
-        return True
-
-    # Else: offline as before
-    random.shuffle(days)
-    random.shuffle(slots)
-    random.shuffle(rooms)
-    needed_rooms = get_elective_room_count(course)
-    for day in days:
-        for time in slots:
-            if any(time in group_used[g][day] for g in groups):
-                continue
-            available_rooms = [room for room in rooms if not room_used[room][day][time]]
-            if len(available_rooms) >= needed_rooms:
-                room_string = ",".join(available_rooms[:needed_rooms])
-                for g in groups:
-                    genes.append(Gene(
-                        group=g,
-                        course=course,
-                        type=typ,
-                        day=day,
-                        time=time,
-                        room=room_string,
-                        delivery_mode="offline"
-                    ))
-                    group_used[g][day].add(time)
-                    group_ep, group_year = get_group_ep_year(g)
-                    for assigned_room in available_rooms[:needed_rooms]:
-                        room_used[assigned_room][day][time][g] = (course, typ, group_ep, group_year)
-                return True
-
-    # Fallback as before...
-    if len(groups) == 1:
-        g = groups[0]
-        # Try ALL day-time combinations, shuffled (KEY FIX)
-        day_time_pairs = [(d, t) for d in days for t in slots]
-        random.shuffle(day_time_pairs)
-        for day, time in day_time_pairs:
-            if time in group_used[g][day]:
+        room_idx = occupancy.pick_rooms(rows, day, slot, int(table.room_count[sessions[0]]))
+        room = occupancy.room_ids_for(room_idx)
+    occupancy.book(rows, table.group[sessions], day, slot, room_idx)
+    _write(schedule, rows, sessions, day, slot, room)
+
+def _open_cells(occupancy, rows, index):
+    # Cells allowed for the batch of session `index` that still have enough free rooms
+    table = occupancy.table
+    ok = occupancy.allowed[table.group[index]]
+    if not table.is_pe[index]:
+        ok = ok & (occupancy.free_rooms[rows] >= table.room_count[index])
+    return ok
+
+def assign_offline(occupancy, rows, sessions, schedule):
+    # Place the sessions of one batch together, in every chromosome of `rows` at once.
+    # Returns a flag per row telling whether a free (day, slot) was found.
+    ok = occupancy.group_free(rows, occupancy.table.group[sessions]) & _open_cells(occupancy, rows, sessions[0])
+    (day, slot), found = occupancy.pick_cells(ok)
+    place_at(occupancy, rows[found], sessions, day[found], slot[found], schedule)
+    return found
+
+def try_assign_batch(occupancy, row, sessions, schedule, attempts=BATCH_SPLIT_ATTEMPTS):
+    # Joint batch of one chromosome that found no common slot: split it greedily.
+    # Each attempt books the largest subgroup that is free in one open cell (rooms are
+    # interchangeable, so any free room will do). Returns the sessions left unplaced.
+    rows, first = np.array([row]), sessions[0]
+    while len(sessions) and attempts > 0:
+        attempts -= 1
+        free = ~occupancy.group_busy[row, occupancy.table.group[sessions]] & _open_cells(occupancy, rows, first)
+        counts = free.sum(axis=0)
+        if not counts.any():
+            break
+        (day, slot), _ = occupancy.pick_cells((counts == counts.max())[None])
+        subgroup = free[:, day[0], slot[0]]
+        place_at(occupancy, rows, sessions[subgroup], day, slot, schedule)
+        sessions = sessions[~subgroup]
+    return sessions
+
+def report_unplaced(table, schedule):
+    # Every batch with sessions that found no free slot, and in how many chromosomes
+    missing = (schedule[0] < 0).sum(axis=0)
+    report = []
+    for index, batch in enumerate(table.batches):
+        count = int(missing[batch["sessions"]].max())
+        if count:
+            groups = [g for g, i in zip(batch["groups"], batch["sessions"]) if missing[i]]
+            report.append({"batch": index, "course": batch["course"], "type": batch["type"],
+                           "groups": groups, "chromosomes": count})
+    return report
+
+def merge_unplaced(reports):
+    # One report for a population built in parts (pool chunks, islands): counts add up
+    merged = {}
+    for report in reports:
+        for entry in report:
+            if entry["batch"] not in merged:
+                merged[entry["batch"]] = dict(entry, groups=list(entry["groups"]))
                 continue
-            available_rooms = [room for room in rooms if not room_used[room][day][time]]
-            if len(available_rooms) >= needed_rooms:
-                room_string = ",".join(available_rooms[:needed_rooms])
-                genes.append(Gene(
-                    group=g,
-                    course=course,
-                    type=typ,
-                    day=day,
-                    time=time,
-                    room=room_string,
-                    delivery_mode="offline"
-                ))
-                group_used[g][day].add(time)
-                group_ep, group_year = get_group_ep_year(g)
-                for assigned_room in available_rooms[:needed_rooms]:
-                    room_used[assigned_room][day][time][g] = (course, typ, group_ep, group_year)
-                return True
-        return False
+            total = merged[entry["batch"]]
+            total["chromosomes"] += entry["chromosomes"]
+            total["groups"] += [g for g in entry["groups"] if g not in total["groups"]]
+    return [merged[batch] for batch in sorted(merged)]
+
+def record_unplaced(unplaced, size, verbose=False, metrics=None):
+    # Unplaced batches go to the run report on every path; verbose runs print a one-line summary
+    (metrics or NO_METRICS).record("unplaced", {"chromosomes": size, "batches": unplaced})
+    if verbose and unplaced:
+        worst = max(unplaced, key=lambda entry: entry["chromosomes"])
+        print(f"{len(unplaced)} batches found no free slot in some chromosomes (most often "
+              f"{worst['course']} ({worst['type']}), in {worst['chromosomes']}/{size}); see the run report")
+
+def _random_pick(options, keys, rng):
+    # One random entry of options[k] for every k in keys (options: one index list per key)
+    width = max(len(o) for o in options)
+    padded = np.array([o + o[:1] * (width - len(o)) for o in options])
+    counts = np.array([len(o) for o in options])
+    return padded[keys, (rng.random(len(keys)) * counts[keys]).astype(int)]
+
+def place_unassigned(table, schedule, rng):
+    # Sessions that found no free slot still need a position: put them anywhere
+    # allowed for their group (will be penalized for conflicts)
+    day, slot, room = schedule
+    rows, index = np.nonzero(day < 0)
+    if not len(index):
+        return
+    group = table.group[index]
+    online = table.online[index]
+    all_days, all_slots = list(range(len(DAYS))), list(range(len(TIMESLOTS)))
+    day[rows, index] = _random_pick([d or all_days for d in table.group_days], group, rng)
+    slot[rows, index] = np.where(
+        online,
+        rng.choice(table.online_slots, len(index)),
+        _random_pick([s or all_slots for s in table.group_slots], group, rng)
+    )
+    room[rows, index] = np.where(
+        online, table.online_room,
+        np.where(table.is_pe[index], table.gym_room, rng.choice(table.base_rooms, len(index)))
+    )
+
+def generate_initial_population(raw_genes, rooms, table=None, size=None):
+    # All chromosomes are built side by side: each session is placed in every
+    # chromosome with a handful of occupancy-mask operations. Returns the population
+    # and the report_unplaced list of batches that found no free slot.
+    if table is None:
+        table = SessionTable(raw_genes, rooms)
+    size = size or POPULATION_SIZE
+    rng = np.random.default_rng(random.getrandbits(64))
+    occupancy = Occupancy(table, rooms, size, rng)
+    # Warm start: sessions of the previous timetable keep their cells, only the rest is placed
+    start = table.empty_arrays() if table.previous is None else table.previous
+    schedule = tuple(np.tile(column, (size, 1)) for column in start)
+    kept = np.flatnonzero(start[0] >= 0)
+    if len(kept):
+        occupancy.book_placed(kept, *(column[kept] for column in start))
+    rows = np.arange(size)
+    for batch in table.batches:
+        sessions = np.array(batch["sessions"])
+        sessions = sessions[start[0][sessions] < 0]
+        if not len(sessions):
+            continue
+        if table.online[sessions[0]]:
+            for index in sessions:
+                assign_online(occupancy, rows, index, schedule)
+            continue
+        placed = assign_offline(occupancy, rows, sessions, schedule)
+        if batch["joint"]:
+            for row in rows[~placed]:
+                try_assign_batch(occupancy, row, sessions, schedule)
+
+    # Anything still unplaced gets a random position from place_unassigned below
+    unplaced = report_unplaced(table, schedule)
+    place_unassigned(table, schedule, rng)
+    population = [Chromosome(table, day, slot, room) for day, slot, room in zip(*schedule)]
+    calculate_population_fitness(population)
+    return population, unplaced
+
+def calculate_population_fitness(population, cache=None, metrics=None):
+    # Score the dirty chromosomes in one batched call instead of one evaluation per child;
+    # genomes already in the fitness cache are not scored again
+    pending = [c for c in population if c.dirty]
+    if cache is not None:
+        missed = []
+        for chromosome in pending:
+            chromosome.fitness = cache.get(chromosome.genome_hash())
+            if chromosome.dirty:
+                missed.append(chromosome)
+        pending = missed
+    if not pending:
+        return
+    metrics = metrics or NO_METRICS
+    table = pending[0].table
+    with metrics.phase("evaluate"):
+        fitness = evaluate_population(
+            table,
+            np.stack([c.day for c in pending]),
+            np.stack([c.slot for c in pending]),
+            np.stack([c.room for c in pending])
+        )
+    metrics.count("evaluations", len(pending))
+    for chromosome, value in zip(pending, fitness.tolist()):
+        chromosome.fitness = value
+        if cache is not None:
+            cache.put(chromosome.genome_hash(), value)
+
+def parent_selector(population):
+    # Returns a function drawing one parent from the population according to config.SELECTION
+    if SELECTION == "tournament":
+        size = min(TOURNAMENT_SIZE, len(population))
+        return lambda: min(random.sample(population, size), key=lambda x: x.fitness)
+    if SELECTION == "rank":
+        ranked = sorted(population, key=lambda x: x.fitness, reverse=True)  # worst gets weight 1
+        weights = list(itertools.accumulate(range(1, len(ranked) + 1)))
+        return lambda: random.choices(ranked, cum_weights=weights)[0]
+    if SELECTION == "uniform":
+        return lambda: random.choice(population)
+    raise ValueError(f"Unknown SELECTION {SELECTION!r}: use 'tournament', 'rank' or 'uniform'")
+
+def mutate_child(child):
+    # mutate only allowed fields for online lectures
+    table = child.table
+    index = random.randrange(len(child))
+    group = table.group[index]
+    if table.online[index]:
+        attr = random.choice(["time", "day"])
+        if attr == "time":
+            child.update_gene(index, slot=random.choice(table.online_slots))
+        elif attr == "day":
+            child.update_gene(index, day=random.choice(table.group_days[group]))
+        # Never mutate room for online lectures!
     else:
-        for sz in range(len(groups) - 1, 0, -1):
-            for subgroups in itertools.combinations(groups, sz):
-                assigned = try_assign_batch(list(subgroups), course, typ, days, slots, rooms, group_used, room_used, genes)
-                if assigned:
-                    rest = [g for g in groups if g not in subgroups]
-                    try_assign_batch(rest, course, typ, days, slots, rooms, group_used, room_used, genes)
-                    return True
-        return False
-
-def generate_initial_population(raw_genes, rooms):
-    population = []
-    for _ in range(POPULATION_SIZE):
-        genes = []
-        group_used = defaultdict(lambda: defaultdict(set))
-        room_used = defaultdict(lambda: defaultdict(lambda: defaultdict(dict)))
-        def get_gene_group(gene):
-            if "joint_groups" in gene:
-                return gene["joint_groups"][0]
-            else:
-                return gene["group"]
-        raw_genes_sorted = sorted(raw_genes, key=get_gene_group)
-        for gene_data in raw_genes_sorted:
-            typ = gene_data["type"]
-            delivery_mode = gene_data.get("delivery_mode", "offline")
-            if "joint_groups" in gene_data:
-                groups = gene_data["joint_groups"]
-                course = gene_data["course"]
-                group = groups[0]
-                days, slots = get_valid_slots_for_group(group)
-                try_assign_batch(groups, course, typ, days, slots, rooms, group_used, room_used, genes, delivery_mode)
-            else:
-                group = gene_data["group"]
-                course = gene_data["course"]
-                days, slots = get_valid_slots_for_group(group)
-                random.shuffle(days)
-                random.shuffle(slots)
-                is_pe = "physical education" in course.lower() or course.strip().upper() == "PE"
-                if typ.lower() == "lecture" and delivery_mode == "online":
-                    # Schedule online lectures only at allowed time slots
-                    online_slots = ["18:00", "19:00", "20:00", "21:00"]
-                    assigned = False
-                    for day in days:
-                        for time in online_slots:
-                            if time not in group_used[group][day]:
-                                genes.append(Gene(
-                                    group=group,
-                                    course=course,
-                                    type=typ,
-                                    day=day,
-                                    time=time,
-                                    room="Online",
-                                    delivery_mode="online"
-                                ))
-                                group_used[group][day].add(time)
-                                assigned = True
-                                break
-                        if assigned:
-                            break
-                    if not assigned:
-                        day = random.choice(days)
-                        time = random.choice(online_slots)
-                        genes.append(Gene(
-                            group=group,
-                            course=course,
-                            type=typ,
-                            day=day,
-                            time=time,
-                            room="Online",
-                            delivery_mode="online"
-                        ))
-                        group_used[group][day].add(time)
-                    continue
-                if is_pe:
-                    room = "Gym"
-                    candidate_rooms = ["Gym"]
-                else:
-                    candidate_rooms = [r for r in rooms if r.strip().lower() != "gym"]
-                    random.shuffle(candidate_rooms)
-                found = False
-                elective_room_count = get_elective_room_count(course)
-                # Try ALL day-time combinations, shuffled (KEY FIX)
-                day_time_pairs = [(d, t) for d in days for t in slots]
-                random.shuffle(day_time_pairs)
-                for day, time in day_time_pairs:
-                    if time in group_used[group][day]:
-                        continue
-                    if is_pe:
-                        genes.append(Gene(
-                            group=group,
-                            course=course,
-                            type=typ,
-                            day=day,
-                            time=time,
-                            room="Gym",
-                            delivery_mode="offline"
-                        ))
-                        group_used[group][day].add(time)
-                        room_used["Gym"][day][time][group] = (course, typ, "GYM", 0)
-                        found = True
-                        break
-                    else:
-                        available_rooms = [room for room in candidate_rooms if not room_used[room][day][time]]
-                        if len(available_rooms) >= elective_room_count:
-                            room_string = ",".join(available_rooms[:elective_room_count])
-                            genes.append(Gene(
-                                group=group,
-                                course=course,
-                                type=typ,
-                                day=day,
-                                time=time,
-                                room=room_string,
-                                delivery_mode="offline"
-                            ))
-                            group_used[group][day].add(time)
-                            ep, study_year_val = get_group_ep_year(group)
-                            for assigned_room in available_rooms[:elective_room_count]:
-                                room_used[assigned_room][day][time][group] = (course, typ, ep, study_year_val)
-                            found = True
-                            break
-                if not found:
-                    # Could not assign—could add to an "unassigned" list or log
-                    pass
-        chromosome = Chromosome(genes)
-        chromosome.calculate_fitness()
-        population.append(chromosome)
-    return population
-
-def select_parents(population):
-    sorted_pop = sorted(population, key=lambda x: x.fitness)
-    return sorted_pop[:2]
-
-def evolve_population(population, rooms):
-    next_gen = []
-    best = min(population, key=lambda x: x.fitness)
-
-    while len(next_gen) < POPULATION_SIZE:
-        parent1, parent2 = random.sample(population, 2)
+        child.mutate(timeslots=table.group_slots[group], days=table.group_days[group],
+                     rooms=table.base_rooms, index=index)
+
+def breed_child(population, select=None, metrics=None):
+    metrics = metrics or NO_METRICS
+    if select is None:
+        select = parent_selector(population)
+    with metrics.phase("crossover"):
+        parent1, parent2 = select(), select()
         if random.random() < CROSSOVER_RATE:
             child = parent1.crossover(parent2)
         else:
-            child = deepcopy(random.choice([parent1, parent2]))
-
-        # mutate only allowed fields for online lectures
-        gene = random.choice(child.genes)
-        if getattr(gene, "delivery_mode", "offline") == "online" and gene.type.lower() == "lecture":
-            attr = random.choice(["time", "day"])
-            if attr == "time":
-                gene.time = random.choice(["18:00", "19:00", "20:00", "21:00"])
-            elif attr == "day":
-                days, _ = get_valid_slots_for_group(gene.group)
-                gene.day = random.choice(days)
-            # Never mutate room for online lectures!
-        else:
-            group = gene.group
-            days, slots = get_valid_slots_for_group(group)
-            child.mutate(timeslots=slots, days=days, rooms=rooms)
-        child.calculate_fitness()
-        next_gen.append(child)
-    return next_gen, best
+            child = random.choice([parent1, parent2]).copy()
+
+    # MUTATION_RATE is the chance that a child has one session moved; unmutated children
+    # of identical parents keep a cached genome
+    with metrics.phase("mutate"):
+        if random.random() < MUTATION_RATE:
+            mutate_child(child)
+
+    # Memetic step: move sessions that are in hard conflicts to clash-free cells
+    with metrics.phase("repair"):
+        if random.random() < REPAIR_RATE:
+            repair(child)
+    return child
+
+def evolve_population(population, rooms, executor=None, workers=1, cache=None, metrics=None):
+    metrics = metrics or NO_METRICS
+    ranked = sorted(population, key=lambda x: x.fitness)
+    best = ranked[0]
+
+    # Elitism: the best chromosomes survive unchanged (copy-on-write copies)
+    next_gen = [c.copy() for c in ranked[:ELITISM]]
+    count = max(0, POPULATION_SIZE - len(next_gen))
+
+    if executor is not None:
+        # Workers breed and score the children; only the round trip is timed here
+        with metrics.phase("parallel_evolve"):
+            next_gen += parallel_evolve(executor, population, count, workers, cache, metrics)
+        return next_gen, best
+
+    select = parent_selector(population)
+    children = [breed_child(population, select, metrics) for _ in range(count)]
+    calculate_population_fitness(children, cache, metrics)
+    return next_gen + children, best
+
+def run_scheduler(raw_genes, rooms, verbose=True, workers=None, islands=None, progress=None, cancel=None, seed=None,
+                  metrics=None, time_budget=None, target_fitness=None, checkpoint=None, resume=None,
+                  warm_start=None, deviation_penalty=None):
+    """
+    Evolve a timetable and return (best_schedule, best_fitness_progress, run), where run is
+    Budget.summary(): why the run stopped and how much of its time budget it used.
+    progress(generation, best_fitness) is called after every generation; setting the
+    `cancel` event stops the run after the current generation with the best schedule so far.
+    A seed (default config.RANDOM_SEED) makes the run reproducible. Phase timings and
+    counters (evaluations, fitness cache hits) are recorded in `metrics`, a RunMetrics.
+    With a time_budget (seconds, default config.TIME_BUDGET) the run evolves until the budget
+    is spent instead of for GENERATIONS; target_fitness stops it as soon as it is reached.
+    The run summary is recorded in metrics too.
+    With a checkpoint path the population is saved there every CHECKPOINT_INTERVAL
+    generations; resume continues a checkpointed run (same input and trimester) where it
+    stopped. Checkpoints need a single population (islands=1).
+    warm_start is a previously exported schedule.json: its sessions keep their cells in the
+    initial population and only new or changed ones are placed. Each kept session moved
+    later costs deviation_penalty (default config.DEVIATION_PENALTY).
+    """
+    workers = workers or WORKERS
+    islands = islands or ISLANDS
+    if islands > 1 and (checkpoint is not None or resume is not None):
+        raise ValueError("Checkpoints are only supported with a single population (islands=1)")
+    seed = RANDOM_SEED if seed is None else seed
+    if seed is not None:
+        random.seed(seed)
+    metrics = metrics or NO_METRICS
+    table = SessionTable(raw_genes, rooms)
+    if warm_start is not None:
+        table.set_previous(*previous_placement(table, rooms, warm_start),
+                           DEVIATION_PENALTY if deviation_penalty is None else deviation_penalty)
+        if verbose:
+            print(f"Warm start from {warm_start}: {int((table.previous[0] >= 0).sum())} of {table.size} "
+                  f"sessions keep their placement")
+    resumed = None
+    if resume is not None:
+        resumed = load_checkpoint(resume, table)  # also restores the random module state
+        if verbose:
+            print(f"Resuming {resume} at generation {resumed[2]['generation']}")
+    budget = Budget(TIME_BUDGET if time_budget is None else time_budget,
+                    TARGET_FITNESS if target_fitness is None else target_fitness,
+                    spent=resumed[2]["elapsed"] if resumed else 0.0)
+    cache = FitnessCache()
+    if islands > 1:
+        best, best_fitness_progress = run_islands(table, rooms, islands, verbose, progress, cancel, cache,
+                                                  metrics, budget)
+    elif workers > 1:
+        with create_executor(table, rooms, workers) as executor:
+            best, best_fitness_progress = _run_generations(table, rooms, verbose, executor, workers, progress, cancel,
+                                                           cache, metrics, budget, checkpoint, resumed)
+    else:
+        best, best_fitness_progress = _run_generations(table, rooms, verbose, progress=progress, cancel=cancel,
+                                                       cache=cache, metrics=metrics, budget=budget,
+                                                       checkpoint=checkpoint, resumed=resumed)
 
-def run_scheduler(raw_genes, rooms, verbose=True):
-    population = generate_initial_population(raw_genes, rooms)
+    run = budget.summary()
+    metrics.record("run", run)
+    if warm_start is not None:
+        kept, moved = int((table.previous[0] >= 0).sum()), moved_sessions(best)
+        metrics.record("warm_start", {"sessions": table.size, "kept": kept, "moved": moved})
+        if verbose:
+            print(f"{moved} of the {kept} kept sessions moved")
+    metrics.count("fitness_cache_hits", cache.hits)
+    metrics.count("fitness_cache_lookups", cache.lookups)
+    if verbose:
+        print(f"Fitness cache hit rate: {cache.hit_rate:.1%} ({cache.hits} of {cache.lookups} lookups)")
+    return best, best_fitness_progress, run
 
-    best_fitness = float("inf")
-    stagnant = 0
-    best_fitness_progress = []  # Track best fitness at each generation
+def _run_generations(table, rooms, verbose, executor=None, workers=1, progress=None, cancel=None, cache=None,
+                     metrics=NO_METRICS, budget=None, checkpoint=None, resumed=None):
+    budget = budget or Budget()
+    if resumed is not None:
+        population, best_schedule, state = resumed
+        generation, stagnant = state["generation"], state["stagnant"]
+        best_fitness_progress = state["progress"]
+        best_fitness = best_fitness_progress[-1] if best_fitness_progress else float("inf")
+    else:
+        with metrics.phase("initial_population"):
+            if executor is not None:
+                population, unplaced = parallel_initial_population(executor, table, POPULATION_SIZE, workers)
+            else:
+                population, unplaced = generate_initial_population(None, rooms, table=table)
+        record_unplaced(unplaced, POPULATION_SIZE, verbose, metrics)
 
-    for generation in range(GENERATIONS):
-        population, best = evolve_population(population, rooms)
+        best_schedule = min(population, key=lambda x: x.fitness)
+        best_fitness = float("inf")
+        stagnant = 0
+        best_fitness_progress = []  # Track best fitness at each generation
+        generation = 0
+
+    last_generation = 0.0  # seconds, so a time budget stops before a generation would overrun it
+    while not budget.stop(generation, stagnant, best_schedule.fitness, last_generation):
+        if cancel is not None and cancel.is_set():
+            budget.reason = "cancelled"
+            if verbose:
+                print("Cancelled.")
+            break
+        started = time.time()
+        population, best = evolve_population(population, rooms, executor, workers, cache, metrics)
+        metrics.count("generations")
+        generation += 1
+        last_generation = time.time() - started
 
         if best.fitness < best_fitness:
             best_fitness = best.fitness
@@ -305,13 +396,19 @@ def run_scheduler(raw_genes, rooms, verbose=True):
             stagnant += 1
 
         best_fitness_progress.append(best_fitness)
+        if progress is not None:
+            progress(generation, best_fitness)
         if verbose:
-            print(f"Generation {generation + 1} | Best Fitness: {best_fitness}")
-
-        if stagnant >= EARLY_STOP_GENERATIONS:
-            if verbose:
-                print("Stopping early due to no improvement.")
-            break
-        print("Best fitness progress:", best_fitness_progress)
+            print(f"Generation {generation} | Best Fitness: {best_fitness}")
+        if checkpoint is not None and CHECKPOINT_INTERVAL and generation % CHECKPOINT_INTERVAL == 0:
+            with metrics.phase("checkpoint"):
+                save_checkpoint(checkpoint, table, population, best_schedule, {
+                    "generation": generation, "stagnant": stagnant,
+                    "progress": best_fitness_progress, "elapsed": budget.used,
+                })
 
+    if verbose and budget.reason == "early_stop":
+        print("Stopping early due to no improvement.")
+    elif verbose and budget.reason in ("time_budget", "target_fitness"):
+        print(f"Stopped after {generation} generations ({budget.reason}, {budget.used:.1f}s used).")
     return best_schedule, best_fitness_progress
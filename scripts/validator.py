@@ -1,7 +1,7 @@
 # scripts/validator.py
 
 from collections import defaultdict
-from scripts.config import FIRST_YEAR_TIMESLOTS, UPPER_YEAR_TIMESLOTS, GROUP_YEAR_DAYS
+from scripts.groups import get_group_info
 
 def validate_schedule(chromosome):
     errors = []
@@ -23,12 +23,9 @@ def validate_schedule(chromosome):
             group_conflicts[group_key].append(gene)
 
             # Classic day/time checks
-            year = int(gene.group.split("-")[1][:2])
-            admission_year = 2000 + year
-            # NOTE: double-check if '+1' is required for your year logic
-            study_year = 2024 - admission_year + 1
-            allowed_days = GROUP_YEAR_DAYS.get(study_year, [])
-            allowed_slots = FIRST_YEAR_TIMESLOTS if study_year == 1 else UPPER_YEAR_TIMESLOTS
+            info = get_group_info(gene.group)
+            allowed_days = info.days
+            allowed_slots = info.slots
 
             if gene.day not in allowed_days:
                 errors.append(f"{gene.group} scheduled on invalid day: {gene.day}")
@@ -0,0 +1,51 @@
+# scripts/warm_start.py
+
+from scripts.encoding import DAY_INDEX, SLOT_INDEX
+from scripts.schedule_json import iter_schedule
+
+def previous_placement(table, rooms, source):
+    """
+    Day/slot/room arrays of the table's sessions as placed in a previously exported
+    schedule.json (path or file object), -1 for sessions it cannot place: new sessions,
+    sessions whose delivery mode changed and sessions in rooms that no longer exist.
+    Repeated (group, course, type) sessions are matched in file order.
+    """
+    placed = {}
+    for group, sessions in iter_schedule(source):
+        for entry in sessions:
+            key = (group, entry.get("course"), entry.get("type"))
+            placed.setdefault(key, []).append(entry)
+    for entries in placed.values():
+        entries.reverse()  # popped from the end below, so the first entry is used first
+
+    day, slot, room = table.empty_arrays()
+    known_rooms = set(rooms)
+    columns = zip(table.group.tolist(), table.course.tolist(), table.type.tolist())
+    for i, (g, c, t) in enumerate(columns):
+        entries = placed.get((table.groups[g], table.courses[c], table.types[t]))
+        if not entries:
+            continue
+        entry = entries.pop()
+        if entry.get("day") not in DAY_INDEX or entry.get("time") not in SLOT_INDEX:
+            continue
+        online = entry.get("delivery_mode", "offline") == "online" and table.is_lecture[i]
+        if online != table.online[i]:
+            continue
+        if table.online[i]:
+            room_id = table.online_room
+        elif table.is_pe[i]:
+            room_id = table.gym_room
+        else:
+            parts = str(entry.get("room", "")).split(",")
+            if not known_rooms.issuperset(parts):
+                continue
+            room_id = table.room_id(",".join(parts))
+        day[i], slot[i], room[i] = DAY_INDEX[entry["day"]], SLOT_INDEX[entry["time"]], room_id
+    return day, slot, room
+
+
+def moved_sessions(chromosome):
+    """How many sessions kept from the previous timetable are no longer where they were."""
+    day, slot, room = chromosome.table.previous
+    moved = (chromosome.day != day) | (chromosome.slot != slot) | (chromosome.room != room)
+    return int((moved & (day >= 0)).sum())
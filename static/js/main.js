@@ -101,15 +101,24 @@ document.addEventListener('DOMContentLoaded', function () {
     // Download buttons setup
     document.getElementById('downloadExcel').onclick = function (e) {
         e.preventDefault();
-        triggerDownload(`/download_excel?trimester=${getSelectedTrimester()}`);
+        triggerDownload(downloadUrl('excel'));
     };
     document.getElementById('downloadJson').onclick = function (e) {
         e.preventDefault();
-        triggerDownload(`/download_json?trimester=${getSelectedTrimester()}`);
+        triggerDownload(downloadUrl('json'));
     };
 
+    // Cancel button: the job stops after its current generation and keeps its best schedule
+    const cancelBtn = document.getElementById("cancelBtn");
+    if (cancelBtn) {
+        cancelBtn.addEventListener("click", async function () {
+            if (!currentJobId) return;
+            this.disabled = true;
+            await fetch(`/jobs/${currentJobId}/cancel`, { method: 'POST' });
+        });
+    }
 
-    // Generate button logic
+    // Generate button logic: submit a job, then follow its progress
     const generateBtn = document.getElementById("generateBtn");
     if (generateBtn) {
         generateBtn.addEventListener("click", async function () {
@@ -122,27 +131,76 @@ document.addEventListener('DOMContentLoaded', function () {
             const formData = new FormData();
             formData.append('file', fileInput.files[0]);
             formData.append('trimester', trimester);
+            const timeBudget = document.getElementById("timeBudget");
+            if (timeBudget && timeBudget.value) formData.append('time_budget', timeBudget.value);
             this.disabled = true;
             this.innerHTML = 'Processing... <span class="spinner-border spinner-border-sm"></span>';
             try {
                 const response = await fetch('/generate_schedule', { method: 'POST', body: formData });
                 if (!response.ok) throw new Error("Failed to generate schedule!");
-                const metrics = await response.json();
-                showMetrics(metrics);
-                showFitnessProgress(metrics);
+                const job = await response.json();
+                currentJobId = job.job_id;
+                resetFitnessProgress();
+                if (cancelBtn) {
+                    cancelBtn.disabled = false;
+                    cancelBtn.style.display = "";
+                }
+                const result = await followJob(job.job_id);
+                if (result.status === "failed") throw new Error(result.error || "Schedule generation failed!");
+                if (!result.metrics) throw new Error("Schedule generation was cancelled.");
+                showMetrics(result.metrics);
+                showFitnessProgress(result.metrics);
+                showRunReport(result.metrics.report);
                 document.getElementById('downloadLinks').style.display = "flex";
-                triggerDownload(`/download_excel?trimester=${trimester}`);
-                triggerDownload(`/download_json?trimester=${trimester}`);
-                this.innerHTML = "Generate Schedule";
+                triggerDownload(downloadUrl('excel'));
+                triggerDownload(downloadUrl('json'));
             } catch (e) {
                 alert("Error: " + e.message);
-                this.innerHTML = "Generate Schedule";
             }
+            if (cancelBtn) cancelBtn.style.display = "none";
+            this.innerHTML = "Generate Schedule";
             this.disabled = false;
         });
     }
 });
 
+let currentJobId = null;
+
+function downloadUrl(kind) {
+    const job = currentJobId ? `&job=${currentJobId}` : '';
+    return `/download_${kind}?trimester=${getSelectedTrimester()}${job}`;
+}
+
+// Resolves with the final job state; streams progress over SSE, polling if EventSource is unavailable
+function followJob(jobId) {
+    if (!window.EventSource) return pollJob(jobId);
+    return new Promise((resolve, reject) => {
+        const source = new EventSource(`/jobs/${jobId}/events`);
+        source.addEventListener('progress', e => appendFitnessProgress(JSON.parse(e.data)));
+        source.addEventListener('done', e => {
+            source.close();
+            resolve(JSON.parse(e.data));
+        });
+        source.onerror = () => {
+            source.close();
+            pollJob(jobId).then(resolve, reject);
+        };
+    });
+}
+
+async function pollJob(jobId) {
+    let seen = fitnessTrendChart ? fitnessTrendChart.data.labels.length : 0;
+    while (true) {
+        const response = await fetch(`/jobs/${jobId}?since=${seen}`);
+        if (!response.ok) throw new Error("Lost track of the generation job!");
+        const state = await response.json();
+        appendFitnessProgress(state);
+        seen = state.generation;
+        if (["done", "failed", "cancelled"].includes(state.status)) return state;
+        await new Promise(r => setTimeout(r, 2000));
+    }
+}
+
 function showMetrics(metrics) {
     document.getElementById('fitnessScore').textContent = metrics.fitnessScore + '%';
     document.getElementById('conflictsCount').textContent = metrics.conflicts;
@@ -151,6 +209,45 @@ function showMetrics(metrics) {
     document.getElementById('genTime').textContent = metrics.time + 's';
 }
 
+// Per-phase timings and counters of the run (GET /jobs/<id>/report serves the same JSON)
+function showRunReport(report) {
+    const panel = document.getElementById('runReport');
+    if (!panel || !report) return;
+    const rows = Object.entries(report.phases).map(([name, phase]) =>
+        `<tr><td>${name}</td><td>${phase.seconds.toFixed(2)}</td><td>${phase.calls}</td></tr>`);
+    document.getElementById('runReportPhases').innerHTML = rows.join('');
+    const summary = [];
+    if (report.counters.generations) summary.push(`${report.counters.generations} generations`);
+    if (report.evaluations_per_second) summary.push(`${report.evaluations_per_second} evaluations/s`);
+    if (report.fitness_cache_hit_rate !== undefined) {
+        summary.push(`fitness cache hits ${(100 * report.fitness_cache_hit_rate).toFixed(1)}%`);
+    }
+    if (report.peak_memory_mb !== undefined) summary.push(`peak memory ${report.peak_memory_mb} MB`);
+    if (report.run && report.run.time_budget) {
+        summary.push(`${report.run.budget_used}s of ${report.run.time_budget}s budget`);
+    }
+    if (report.unplaced && report.unplaced.batches.length) {
+        summary.push(`${report.unplaced.batches.length} batches found no free slot`);
+    }
+    if (report.run && report.run.stop_reason) summary.push(`stopped: ${report.run.stop_reason.replace('_', ' ')}`);
+    document.getElementById('runReportSummary').textContent = summary.join(' · ');
+    const unplaced = report.unplaced ? report.unplaced.batches : [];
+    const list = document.getElementById('runReportUnplaced');
+    const shown = 20;
+    // Course and group names come from the uploaded workbook: set them as text, never as HTML
+    const lines = unplaced.slice(0, shown).map(batch =>
+        `${batch.course} (${batch.type}) for ${batch.groups.join(', ')}: ` +
+        `${batch.chromosomes}/${report.unplaced.chromosomes} chromosomes`);
+    if (unplaced.length > shown) lines.push(`… and ${unplaced.length - shown} more`);
+    list.replaceChildren(...lines.map(line => {
+        const item = document.createElement('li');
+        item.textContent = line;
+        return item;
+    }));
+    list.style.display = unplaced.length ? "" : "none";
+    panel.style.display = "";
+}
+
 function showFitnessProgress(metrics) {
     if (metrics.fitness_progress) {
         const progressValues = metrics.fitness_progress.map(x => Math.round(10000 / (1 + x), 2));
@@ -160,6 +257,24 @@ function showFitnessProgress(metrics) {
     }
 }
 
+function resetFitnessProgress() {
+    if (!fitnessTrendChart) return;
+    fitnessTrendChart.data.labels = [];
+    fitnessTrendChart.data.datasets[0].data = [];
+    fitnessTrendChart.update();
+}
+
+// Adds the generations of a progress/poll update to the fitness trend chart
+function appendFitnessProgress(state) {
+    if (!fitnessTrendChart || !state.fitness_progress) return;
+    const start = state.generation - state.fitness_progress.length;
+    state.fitness_progress.forEach((x, i) => {
+        fitnessTrendChart.data.labels.push("Gen " + (start + i + 1));
+        fitnessTrendChart.data.datasets[0].data.push(Math.round(10000 / (1 + x), 2));
+    });
+    fitnessTrendChart.update();
+}
+
 function triggerDownload(url) {
     const a = document.createElement('a');
     a.href = url;
@@ -0,0 +1,18 @@
+# tests/conftest.py
+
+import pytest
+from benchmarks.synthetic import make_workbook, make_joint_lectures
+from scripts.data_loader import preprocess_data, extract_raw_genes
+
+@pytest.fixture(scope="session")
+def workbook(tmp_path_factory):
+    """A small synthetic GA_input workbook (benchmarks/synthetic.py), preprocessed."""
+    path = make_workbook(tmp_path_factory.mktemp("inputs") / "GA_input.xlsx", groups=12, eps=2,
+                         rooms=10, courses_per_trimester=4, seed=1)
+    return preprocess_data(str(path))
+
+@pytest.fixture(scope="session")
+def instance(workbook):
+    """(raw_genes, rooms) of the synthetic workbook for trimester 1, with joint lectures."""
+    raw_genes = make_joint_lectures(extract_raw_genes(workbook["groups"], workbook["courses"], 1), 3)
+    return raw_genes, workbook["rooms"]["Room"].tolist()
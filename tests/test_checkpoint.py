@@ -0,0 +1,38 @@
+# tests/test_checkpoint.py
+
+import threading
+import pytest
+import scripts.budget
+import scripts.scheduler
+from scripts.scheduler import run_scheduler
+
+@pytest.fixture
+def short_run(monkeypatch):
+    # A few generations of a small population, with a checkpoint every 3 of them
+    monkeypatch.setattr(scripts.scheduler, "POPULATION_SIZE", 10)
+    monkeypatch.setattr(scripts.scheduler, "CHECKPOINT_INTERVAL", 3)
+    monkeypatch.setattr(scripts.budget, "GENERATIONS", 8)
+    monkeypatch.setattr(scripts.budget, "EARLY_STOP_GENERATIONS", 100)
+
+def test_resumed_run_reproduces_the_uninterrupted_run(instance, short_run, tmp_path):
+    raw_genes, rooms = instance
+    full, full_progress, _ = run_scheduler(raw_genes, rooms, verbose=False, seed=5)
+
+    # Kill the run after generation 4: the checkpoint of generation 3 is left behind
+    cancel = threading.Event()
+    def progress(generation, fitness):
+        if generation == 4:
+            cancel.set()
+    checkpoint = tmp_path / "run.npz"
+    _, killed_progress, _ = run_scheduler(raw_genes, rooms, verbose=False, seed=5, progress=progress,
+                                          cancel=cancel, checkpoint=str(checkpoint))
+    assert len(killed_progress) < len(full_progress)
+    assert checkpoint.exists()
+
+    # The resumed run restores the random state, so the seed given here does not matter
+    resumed, resumed_progress, _ = run_scheduler(raw_genes, rooms, verbose=False, seed=99,
+                                                 checkpoint=str(checkpoint), resume=str(checkpoint))
+    assert resumed_progress == full_progress
+    assert resumed.fitness == full.fitness
+    for name in ("day", "slot", "room"):
+        assert (getattr(resumed, name) == getattr(full, name)).all()
@@ -0,0 +1,32 @@
+# tests/test_data_loader.py
+
+import pandas as pd
+import pytest
+from scripts.data_loader import extract_raw_genes
+from scripts.groups import get_group_info
+
+def _reference_raw_genes(groups_df, courses_df, trimester):
+    # The row-by-row loops extract_raw_genes replaced, kept as the reference
+    group_name_col = [c for c in groups_df.columns if "group" in c.lower()][0]
+    trimester_col = [c for c in courses_df.columns if "trimester" in c.lower()][0]
+    type_to_column = {"Lecture": "lecture_slots", "Practice": "practice_slots", "Lab": "lab_slots"}
+    raw_genes = []
+    for _, group_row in groups_df.iterrows():
+        group_name = group_row[group_name_col]
+        info = get_group_info(group_name)
+        curriculum_trimester = info.study_year * 3 + trimester - 3
+        ep_courses = courses_df[(courses_df["EP"] == info.ep) &
+                                (courses_df[trimester_col] == curriculum_trimester)]
+        for _, course_row in ep_courses.iterrows():
+            for typ, slots_col in type_to_column.items():
+                total_slots = int(course_row[slots_col]) if slots_col in course_row and pd.notnull(course_row[slots_col]) else 0
+                for _ in range(total_slots // 10):
+                    raw_genes.append({"group": group_name, "course": course_row["course_name"], "type": typ})
+    return raw_genes
+
+@pytest.mark.parametrize("trimester", [1, 2, 3])
+def test_extract_raw_genes_matches_the_reference_loops(workbook, trimester):
+    groups, courses = workbook["groups"], workbook["courses"]
+    raw_genes = extract_raw_genes(groups, courses, trimester)
+    assert raw_genes
+    assert raw_genes == _reference_raw_genes(groups, courses, trimester)
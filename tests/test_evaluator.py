@@ -0,0 +1,35 @@
+# tests/test_evaluator.py
+
+import random
+import numpy as np
+from scripts.encoding import SessionTable
+from scripts.evaluator import evaluate_fitness, evaluate_population, find_conflicts
+from scripts.scheduler import generate_initial_population, mutate_child
+from scripts.repair import repair
+
+def _population(instance, size=8):
+    raw_genes, rooms = instance
+    random.seed(0)
+    table = SessionTable(raw_genes, rooms)
+    population, _ = generate_initial_population(raw_genes, rooms, table=table, size=size)
+    # Children with crossover, mutations and repairs, so that conflicts of every kind appear
+    for parent1, parent2 in zip(population[::2], population[1::2]):
+        child = parent1.crossover(parent2)
+        for _ in range(20):
+            mutate_child(child)
+        population.append(child)
+        repaired = child.copy()
+        repair(repaired)
+        population.append(repaired)
+    return table, population
+
+def test_population_totals_match_evaluate_fitness(instance):
+    table, population = _population(instance)
+    day, slot, room = (np.stack([getattr(c, name) for c in population]) for name in ("day", "slot", "room"))
+    totals = evaluate_population(table, day, slot, room)
+    assert totals.tolist() == [evaluate_fitness(c.genes) for c in population]
+
+def test_population_has_conflicts_to_score(instance):
+    # Guards the parity test against a population that is trivially conflict-free
+    table, population = _population(instance)
+    assert any(find_conflicts(table, c.day, c.slot, c.room)[0].any() for c in population)